@@ -13,6 +13,64 @@ class Settings:
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./hackathon.db")
     MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017/hackathon")
     
+    # Resume parsing
+    RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", str(os.cpu_count() or 1)))
+    RESUME_MAX_CONCURRENT_PARSES = int(os.getenv("RESUME_MAX_CONCURRENT_PARSES", "8"))
+    RESUME_MAX_UPLOAD_BYTES = int(os.getenv("RESUME_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+    RESUME_SPOOL_THRESHOLD_BYTES = int(os.getenv("RESUME_SPOOL_THRESHOLD_BYTES", str(1024 * 1024)))
+    RESUME_PDF_MAX_PAGES = int(os.getenv("RESUME_PDF_MAX_PAGES", "50"))
+    RESUME_MAX_TEXT_BYTES = int(os.getenv("RESUME_MAX_TEXT_BYTES", str(512 * 1024)))
+    RESUME_PARSE_TIMEOUT_SECONDS = float(os.getenv("RESUME_PARSE_TIMEOUT_SECONDS", "10"))  # per worker call
+    RESUME_BATCH_MAX_FILES = int(os.getenv("RESUME_BATCH_MAX_FILES", "500"))
+    RESUME_BATCH_MAX_BYTES = int(os.getenv("RESUME_BATCH_MAX_BYTES", str(100 * 1024 * 1024)))  # whole request
+    RESUME_BATCH_CONCURRENCY = int(os.getenv("RESUME_BATCH_CONCURRENCY", "16"))
+    RESUME_JOB_WORKERS = int(os.getenv("RESUME_JOB_WORKERS", "4"))
+    RESUME_JOB_QUEUE_SIZE = int(os.getenv("RESUME_JOB_QUEUE_SIZE", "100"))
+    RESUME_JOB_RETENTION = int(os.getenv("RESUME_JOB_RETENTION", "1000"))
+    RESUME_CACHE_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    RESUME_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", "")  # empty disables the on-disk tier
+    RESUME_CACHE_DISK_MAX_BYTES = int(os.getenv("RESUME_CACHE_DISK_MAX_BYTES", str(1024 * 1024 * 1024)))  # compressed
+    # Flags near-duplicate resumes (near_duplicate_of); costs a MinHash per document, so off unless wanted
+    RESUME_DEDUP_ENABLED = os.getenv("RESUME_DEDUP_ENABLED", "false").lower() == "true"
+    RESUME_DEDUP_THRESHOLD = float(os.getenv("RESUME_DEDUP_THRESHOLD", "0.9"))  # estimated Jaccard similarity
+    RESUME_DEDUP_MAX_DOCUMENTS = int(os.getenv("RESUME_DEDUP_MAX_DOCUMENTS", "20000"))
+    RESUME_INDEX_ENABLED = os.getenv("RESUME_INDEX_ENABLED", "true").lower() == "true"
+    # Comma-separated emails of the accounts allowed to search everyone's resumes
+    RECRUITER_EMAILS = frozenset(
+        email.strip().lower() for email in os.getenv("RECRUITER_EMAILS", "").split(",") if email.strip()
+    )
+    # Comma-separated emails of the accounts allowed to run admin operations (e.g. taxonomy reloads)
+    ADMIN_EMAILS = frozenset(
+        email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()
+    )
+    
+    # Skill taxonomy
+    SKILL_TAXONOMY_PATH = os.getenv(
+        "SKILL_TAXONOMY_PATH",
+        os.path.join(os.path.dirname(__file__), "data", "skill_taxonomy.json")
+    )
+    SKILL_TAXONOMY_RELOAD_SECONDS = float(os.getenv("SKILL_TAXONOMY_RELOAD_SECONDS", "30"))  # 0 disables hot reload
+    
+    # Job sources: comma-separated, e.g. "greenhouse:acme,lever:initech,rss:https://example.com/jobs.rss,fixture:jobs.json";
+    # empty falls back to the built-in mock postings
+    JOB_SOURCES = os.getenv("JOB_SOURCES", "")
+    JOB_SOURCE_TIMEOUT_SECONDS = float(os.getenv("JOB_SOURCE_TIMEOUT_SECONDS", "5"))
+    JOB_SOURCE_MAX_CONNECTIONS = int(os.getenv("JOB_SOURCE_MAX_CONNECTIONS", "100"))
+    JOB_SOURCE_MAX_CONNECTIONS_PER_HOST = int(os.getenv("JOB_SOURCE_MAX_CONNECTIONS_PER_HOST", "10"))
+    GREENHOUSE_API_URL = os.getenv("GREENHOUSE_API_URL", "https://boards-api.greenhouse.io")
+    LEVER_API_URL = os.getenv("LEVER_API_URL", "https://api.lever.co")
+    JOB_SEARCH_CACHE_TTL_SECONDS = float(os.getenv("JOB_SEARCH_CACHE_TTL_SECONDS", "300"))  # 0 disables the cache
+    JOB_SEARCH_CACHE_STALE_SECONDS = float(os.getenv("JOB_SEARCH_CACHE_STALE_SECONDS", "3600"))  # served while refreshing
+    JOB_SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("JOB_SEARCH_CACHE_MAX_ENTRIES", "1000"))
+    JOB_SEARCH_CACHE_MAX_LIMIT = int(os.getenv("JOB_SEARCH_CACHE_MAX_LIMIT", "100"))  # larger searches aren't cached
+    # Postings persisted in the SQLite database at DATABASE_URL, full-text indexed
+    JOB_STORE_ENABLED = os.getenv("JOB_STORE_ENABLED", "true").lower() == "true"
+    JOB_STORE_MAX_AGE_SECONDS = float(os.getenv("JOB_STORE_MAX_AGE_SECONDS", str(24 * 3600)))  # older scraped postings are re-fetched
+    
+    # Metrics
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    DEBUG_TIMINGS_HEADER = "X-Debug-Timings"
+    
     # API Settings
     API_V1_PREFIX = "/api/v1"
     PROJECT_NAME = "Hackathon API"
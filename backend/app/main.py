@@ -1,8 +1,15 @@
 # app/main.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.config import settings
 from app.routes import api, ai, resume, jobs, auth
+from app.services.database_service import job_store
+from app.services.job_scraper_service import JobScraperService, job_sources
+from app.services.resume_parser_service import ResumeParserService
+from app.services.resume_job_service import resume_jobs
+from app.services.metrics_service import metrics
+from app.services.upload_service import MULTIPART_OVERHEAD_BYTES, BodySizeLimitMiddleware
 
 # Create FastAPI app
 app = FastAPI(
@@ -20,6 +27,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Oversized uploads are refused before starlette receives and spools the whole body
+app.add_middleware(BodySizeLimitMiddleware, limits={
+    f"{settings.API_V1_PREFIX}/resume/upload": settings.RESUME_MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+    f"{settings.API_V1_PREFIX}/resume/batch": settings.RESUME_BATCH_MAX_BYTES
+})
+
 # Include routers
 app.include_router(api.router, prefix=settings.API_V1_PREFIX)
 app.include_router(ai.router, prefix=f"{settings.API_V1_PREFIX}/ai")
@@ -28,6 +41,14 @@ app.include_router(jobs.router, prefix=f"{settings.API_V1_PREFIX}/jobs")
 app.include_router(auth.router, prefix=f"{settings.API_V1_PREFIX}/auth")
 
 
+@app.on_event("shutdown")
+async def shutdown_workers():
+    await resume_jobs.stop()
+    ResumeParserService.shutdown_executor()
+    await job_sources.close()
+    await JobScraperService.wait_for_pending_writes()
+    job_store.close()
+
 @app.get("/")
 async def root():
     return {
@@ -40,6 +61,11 @@ async def root():
 async def health_check():
     return {"status": "healthy", "message": "API is operational"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Per-stage parse timing histograms in Prometheus text format"""
+    return metrics.render_prometheus()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
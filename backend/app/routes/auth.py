@@ -2,6 +2,7 @@
 from fastapi import APIRouter, HTTPException, Depends, Header
 from pydantic import BaseModel, EmailStr
 from typing import Dict, Optional
+from app.config import settings
 from app.services.auth_service import AuthService
 
 router = APIRouter()
@@ -44,6 +45,18 @@ async def get_current_user(authorization: str = Header(None)):
     
     return user
 
+async def get_current_recruiter(current_user: Dict = Depends(get_current_user)):
+    """Like get_current_user, but only for accounts listed in RECRUITER_EMAILS"""
+    if current_user["email"].lower() not in settings.RECRUITER_EMAILS:
+        raise HTTPException(status_code=403, detail="Recruiter access required")
+    return current_user
+
+async def get_current_admin(current_user: Dict = Depends(get_current_user)):
+    """Like get_current_user, but only for accounts listed in ADMIN_EMAILS"""
+    if current_user["email"].lower() not in settings.ADMIN_EMAILS:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
 @router.post("/register")
 async def register(request: RegisterRequest):
     """Register a new user account"""
@@ -91,7 +104,8 @@ async def update_profile(
     # Prepare updates
     updates = {}
     if request.resume_data is not None:
-        updates["resume_data"] = request.resume_data
+        # The text is served from /resume/text/{content_hash}; don't keep a copy on every profile
+        updates["resume_data"] = {key: value for key, value in request.resume_data.items() if key != "raw_text"}
     if request.target_jobs is not None:
         updates["target_jobs"] = request.target_jobs
     if request.learning_progress is not None:
@@ -1,8 +1,14 @@
 # app/routes/jobs.py
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
 from typing import Dict, Optional
+from app.routes.auth import get_current_admin
+from app.services.database_service import job_store
 from app.services.job_scraper_service import JobScraperService
+from app.services.job_matcher_service import JobMatcherService
+from app.services.job_search_cache import job_search_cache
+from app.services.skill_taxonomy import SkillTaxonomy, TaxonomyMismatchError, get_taxonomy, reload_taxonomy
 
 router = APIRouter()
 
@@ -12,10 +18,34 @@ class JobSearchRequest(BaseModel):
     limit: Optional[int] = 10
 
 class SkillsGapRequest(BaseModel):
-    user_skills: Dict  # Skills from resume parsing
+    user_skills: Optional[Dict] = None  # Skills from resume parsing
+    user_skill_vector: Optional[str] = None  # Or the resume's hex skill_vector...
+    taxonomy_version: Optional[str] = None  # ...with the taxonomy_version it was parsed under
     job_title: str
     location: Optional[str] = "United States"
 
+class JobMatchRequest(BaseModel):
+    job_title: str
+    location: Optional[str] = "United States"
+    user_skills: Optional[Dict] = None
+    user_skill_vector: Optional[str] = None
+    taxonomy_version: Optional[str] = None
+    corpus_size: Optional[int] = Field(100, ge=1, le=100000)
+    top_k: Optional[int] = Field(10, ge=1, le=100)
+
+def _user_skill_vector(encoded: Optional[str], version: Optional[str], taxonomy: SkillTaxonomy) -> int:
+    """Decode a resume's skill_vector from a request, refusing one made with another taxonomy"""
+    if encoded is None:
+        return 0
+    if version is None:
+        raise HTTPException(status_code=400, detail="taxonomy_version is required with user_skill_vector")
+    try:
+        return taxonomy.parse_vector(encoded, version)
+    except TaxonomyMismatchError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/search")
 async def search_jobs(request: JobSearchRequest):
     """Search for jobs and analyze requirements"""
@@ -45,6 +75,10 @@ async def search_jobs(request: JobSearchRequest):
 async def analyze_skills_gap(request: SkillsGapRequest):
     """Analyze skills gap between user and job market"""
     
+    if request.user_skills is None and request.user_skill_vector is None:
+        raise HTTPException(status_code=400, detail="Provide user_skills or user_skill_vector")
+    user_vector = _user_skill_vector(request.user_skill_vector, request.taxonomy_version, get_taxonomy())
+    
     try:
         # First, get job requirements
         job_results = await JobScraperService.search_jobs(
@@ -59,7 +93,8 @@ async def analyze_skills_gap(request: SkillsGapRequest):
         # Perform skills gap analysis
         gap_analysis = JobScraperService.get_skills_gap_analysis(
             user_skills=request.user_skills,
-            job_requirements=job_results["top_skills_required"]
+            job_requirements=job_results["top_skills_required"],
+            user_skill_vector=user_vector
         )
         
         return {
@@ -81,6 +116,52 @@ async def analyze_skills_gap(request: SkillsGapRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Skills gap analysis failed: {str(e)}")
 
+@router.post("/match")
+async def match_jobs(request: JobMatchRequest):
+    """Rank a corpus of postings by how well they fit one resume"""
+    
+    if request.user_skills is None and request.user_skill_vector is None:
+        raise HTTPException(status_code=400, detail="Provide user_skills or user_skill_vector")
+    taxonomy = get_taxonomy()
+    user_vector = _user_skill_vector(request.user_skill_vector, request.taxonomy_version, taxonomy)
+    
+    try:
+        job_results = await JobScraperService.search_jobs(
+            job_title=request.job_title,
+            location=request.location,
+            limit=request.corpus_size
+        )
+        
+        if "error" in job_results:
+            raise HTTPException(status_code=500, detail=job_results["error"])
+        
+        for skills in (request.user_skills or {}).values():
+            user_vector |= taxonomy.to_vector(skills)
+        
+        # Scoring a large corpus is CPU-bound; keep it off the event loop
+        ranked = await asyncio.to_thread(
+            JobMatcherService.rank_postings,
+            user_vector,
+            job_results["job_summaries"],
+            taxonomy,
+            top_k=request.top_k
+        )
+        
+        return {
+            "message": "Job matching completed",
+            "job_search": {
+                "title": request.job_title,
+                "location": request.location,
+                "jobs_ranked": job_results["jobs_found"]
+            },
+            "top_matches": ranked
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Job matching failed: {str(e)}")
+
 @router.get("/trending-skills")
 async def get_trending_skills(
     field: str = Query(..., description="CS field (software, data, hardware)"),
@@ -169,4 +250,56 @@ async def quick_job_analysis(
         }
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Quick analysis failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Quick analysis failed: {str(e)}")
+
+@router.get("/postings")
+async def search_stored_postings(
+    q: Optional[str] = Query(None, description="Words that must all appear in the title or description"),
+    skill: Optional[str] = Query(None, description="Only postings requiring this skill"),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Search postings kept in the local job store, without contacting any job source"""
+    if not job_store.enabled:
+        raise HTTPException(status_code=503, detail="Job store is disabled")
+    
+    canonical = (get_taxonomy().canonical(skill) or skill.strip().lower()) if skill else None
+    postings = await asyncio.to_thread(job_store.find_postings, q, canonical, limit)
+    return {"query": q, "skill": canonical, "total": len(postings), "postings": postings}
+
+@router.get("/store/stats")
+async def get_job_store_stats():
+    """Size and age range of the local job store"""
+    return await asyncio.to_thread(job_store.stats)
+
+@router.get("/cache/stats")
+async def get_search_cache_stats():
+    """Job search cache hit/miss counters and size"""
+    return job_search_cache.stats()
+
+@router.get("/taxonomy")
+async def get_skill_taxonomy():
+    """Skill taxonomy version and categories currently in use"""
+    taxonomy = get_taxonomy()
+    return {
+        "version": taxonomy.version,
+        "total_skills": len(taxonomy.skills),
+        "total_aliases": len(taxonomy.aliases),
+        "categories": {
+            taxonomy.category_label(category): sum(
+                1 for categories in taxonomy.skill_categories.values() if category in categories
+            )
+            for category in taxonomy.categories
+        },
+        "emerging": sorted(taxonomy.emerging)
+    }
+
+@router.post("/taxonomy/reload")
+async def reload_skill_taxonomy(current_user: Dict = Depends(get_current_admin)):
+    """Re-read the taxonomy file without restarting workers (admins only)"""
+    previous = get_taxonomy().version
+    taxonomy = reload_taxonomy(force=True)
+    return {
+        "message": "Skill taxonomy reloaded" if taxonomy.version != previous else "Skill taxonomy unchanged",
+        "previous_version": previous,
+        "version": taxonomy.version
+    }
\ No newline at end of file
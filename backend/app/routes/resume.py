@@ -1,50 +1,257 @@
 # app/routes/resume.py
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.services.resume_parser_service import ResumeParserService
-from typing import Dict
+import json
+import re
+from contextlib import ExitStack
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.datastructures import UploadFile as StarletteUploadFile
+from app.config import settings
+from app.routes.auth import get_current_recruiter
+from app.services.metrics_service import StageTimer, metrics
+from app.services.resume_parser_service import RESUME_STAGE_METRIC, ResumeParserService
+from app.services.resume_cache_service import resume_cache
+from app.services.resume_dedup_service import resume_dedup_index
+from app.services.resume_search_service import QuerySyntaxError, resume_index
+from app.services.resume_job_service import QueueFullError, resume_jobs
+from app.services.upload_service import UnsupportedFormatError, UploadTooLargeError
+from typing import Dict, FrozenSet, Optional
 
 router = APIRouter()
 
+# Left out of resume responses unless named in fields=; the text has its own URL
+DEFAULT_EXCLUDED_FIELDS = frozenset({'raw_text'})
+
+CONTENT_HASH_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+class ResumeProjection:
+    """fields= / exclude= query parameters, applied to the top-level keys of parsed resume data"""
+    
+    def __init__(
+        self,
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. skills,contact,raw_text"),
+        exclude: Optional[str] = Query(None, description="Comma-separated fields to leave out")
+    ):
+        self.fields = _split_fields(fields)
+        self.exclude = _split_fields(exclude) or frozenset()
+    
+    def apply(self, data: Dict) -> Dict:
+        if self.fields is not None:
+            return {key: value for key, value in data.items() if key in self.fields and key not in self.exclude}
+        return {
+            key: value for key, value in data.items()
+            if key not in self.exclude and key not in DEFAULT_EXCLUDED_FIELDS
+        }
+
+def _split_fields(value: Optional[str]) -> Optional[FrozenSet[str]]:
+    if not value:
+        return None
+    return frozenset(field.strip() for field in value.split(',') if field.strip())
+
+def _text_url(content_hash: str) -> str:
+    return f"{settings.API_V1_PREFIX}/resume/text/{content_hash}"
+
 @router.post("/upload", response_model=Dict)
-async def upload_resume(file: UploadFile = File(...)):
+async def upload_resume(
+    request: Request,
+    file: UploadFile = File(...),
+    async_mode: bool = Query(False, alias="async", description="Queue the parse and return a job id immediately"),
+    projection: ResumeProjection = Depends()
+):
     """Upload and parse a resume file"""
     
-    # Validate file type
+    # The file type is sniffed from its content while it's read, not taken from the name
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file selected")
     
-    allowed_extensions = ['.pdf', '.docx', '.txt']
-    if not any(file.filename.lower().endswith(ext) for ext in allowed_extensions):
-        raise HTTPException(
-            status_code=400, 
-            detail="Unsupported file type. Please upload PDF, DOCX, or TXT files."
-        )
+    if async_mode:
+        return await _queue_resume(file)
     
     # Parse resume
-    result = await ResumeParserService.parse_resume(file)
+    timer = _request_timer(request)
+    result = await ResumeParserService.parse_resume(file, timer=timer)
     
     if "error" in result:
-        raise HTTPException(status_code=500, detail=result["error"])
+        raise HTTPException(status_code=result.get("status_code", 500), detail=result["error"])
     
-    return {
+    response = {
         "message": "Resume parsed successfully",
-        "data": result
+        "data": projection.apply(result),
+        "text_url": _text_url(result["content_hash"])
     }
+    if request.headers.get(settings.DEBUG_TIMINGS_HEADER):
+        response["timings"] = timer.report()
+    return response
+
+def _request_timer(request: Request) -> StageTimer:
+    """Stage timer for a parse; collects even with metrics off when the debug timings header is set"""
+    return metrics.timer(RESUME_STAGE_METRIC, collect=bool(request.headers.get(settings.DEBUG_TIMINGS_HEADER)))
+
+async def _queue_resume(file: UploadFile) -> JSONResponse:
+    """Spool the upload now (the request body is gone once we return) and hand it to the job queue"""
+    try:
+        upload = await ResumeParserService.spool(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedFormatError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    
+    try:
+        job = await resume_jobs.submit(upload, file.filename)
+    except QueueFullError as e:
+        upload.cleanup()
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return JSONResponse(status_code=202, content={
+        "message": "Resume queued for parsing",
+        "job_id": job.job_id,
+        "status": job.status,
+        "status_url": f"{settings.API_V1_PREFIX}/resume/jobs/{job.job_id}",
+        "events_url": f"{settings.API_V1_PREFIX}/resume/jobs/{job.job_id}/events"
+    })
+
+@router.get("/jobs")
+async def get_job_queue_stats():
+    """Resume job queue depth and worker count"""
+    return resume_jobs.stats()
+
+@router.get("/jobs/{job_id}")
+async def get_resume_job(job_id: str, projection: ResumeProjection = Depends()):
+    """Poll the status (and, once completed, the result) of a queued resume parse"""
+    job = resume_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    data = job.to_dict()
+    if "result" in data:
+        data["result"] = projection.apply(data["result"])
+        data["text_url"] = _text_url(job.result["content_hash"])
+    return data
+
+@router.get("/jobs/{job_id}/events")
+async def stream_resume_job_events(job_id: str):
+    """Server-sent events reporting each parse stage until the job finishes"""
+    job = resume_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def event_stream():
+        async for event in resume_jobs.events(job):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.post("/analyze-skills")
-async def analyze_skills(file: UploadFile = File(...)):
+async def analyze_skills(
+    request: Request,
+    file: UploadFile = File(...),
+    projection: ResumeProjection = Depends()
+):
     """Quick skills analysis from resume"""
     
-    result = await ResumeParserService.parse_resume(file)
+    timer = _request_timer(request)
+    result = await ResumeParserService.parse_resume(file, timer=timer)
     
     if "error" in result:
-        raise HTTPException(status_code=500, detail=result["error"])
+        raise HTTPException(status_code=result.get("status_code", 500), detail=result["error"])
     
     # Return only skills analysis
-    return {
+    response = {
         "filename": result.get("filename"),
         "skills_found": result.get("skills", {}),
         "total_skills": sum(len(skills) for skills in result.get("skills", {}).values()),
         "education": result.get("education", []),
-        "experience": result.get("experience", {})
-    }
\ No newline at end of file
+        "experience": result.get("experience", {}),
+        "years_of_experience": result.get("experience_timeline", {}).get("total_years", 0),
+        "skill_experience": result.get("experience_timeline", {}).get("skills", {})
+    }
+    response = projection.apply(response)
+    if request.headers.get(settings.DEBUG_TIMINGS_HEADER):
+        response["timings"] = timer.report()
+    return response
+
+@router.post("/batch")
+async def batch_upload(request: Request, projection: ResumeProjection = Depends()):
+    """Parse many resumes (or zip archives of resumes) and stream one NDJSON line per resume"""
+    
+    # The form is parsed here rather than through File(...) so the uploads stay
+    # open until the stream finishes instead of being closed when this returns
+    form = await request.form(max_files=settings.RESUME_BATCH_MAX_FILES)
+    files = [item for item in form.getlist("files") if isinstance(item, StarletteUploadFile)]
+    
+    if not files:
+        await form.close()
+        raise HTTPException(status_code=400, detail="No files selected")
+    
+    async def stream_results():
+        # Zip archives stay open until the last of their members has been parsed
+        with ExitStack() as archives:
+            documents = ResumeParserService.iter_batch_documents(files, archives)
+            async for result in ResumeParserService.parse_batch(documents):
+                if "data" in result:
+                    result["data"] = projection.apply(result["data"])
+                yield json.dumps(result) + "\n"
+    
+    return StreamingResponse(
+        stream_results(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(form.close)
+    )
+
+@router.get("/search")
+async def search_resumes(
+    q: str = Query(..., description='Boolean skill query, e.g. python AND (aws OR gcp) AND NOT intern'),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Dict = Depends(get_current_recruiter)
+):
+    """Search every parsed resume by skills and education/experience keywords (recruiters only)"""
+    try:
+        return resume_index.search(q, offset=offset, limit=limit)
+    except QuerySyntaxError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid query: {str(e)}")
+
+@router.get("/search/stats")
+async def get_search_stats():
+    """Number of indexed resumes and distinct search terms"""
+    return resume_index.stats()
+
+@router.get("/text/{content_hash}", response_class=PlainTextResponse)
+async def get_resume_text(content_hash: str, request: Request):
+    """Extracted text of a parsed resume, addressed by the SHA-256 of the uploaded file.
+    
+    The text for a given hash never changes, so clients may cache it
+    indefinitely and revalidate with If-None-Match.
+    """
+    if not CONTENT_HASH_PATTERN.fullmatch(content_hash):
+        raise HTTPException(status_code=400, detail="Invalid content hash")
+    
+    etag = f'"{content_hash}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=31536000, immutable"}
+    if request.headers.get("if-none-match") == etag:
+        # Only revalidate text we still hold; an evicted one is a 404 like any other miss
+        if not resume_cache.has_text(content_hash):
+            raise HTTPException(status_code=404, detail="Resume text not found; upload the file again")
+        return Response(status_code=304, headers=headers)
+    
+    text = resume_cache.get_text(content_hash)
+    if text is None:
+        raise HTTPException(status_code=404, detail="Resume text not found; upload the file again")
+    return PlainTextResponse(text, headers=headers)
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Parse cache hit/miss counters"""
+    return resume_cache.stats()
+
+@router.get("/dedup/stats")
+async def get_dedup_stats():
+    """Near-duplicate index size and how many uploads it has flagged as near-duplicates"""
+    return resume_dedup_index.stats()
\ No newline at end of file
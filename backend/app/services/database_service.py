@@ -0,0 +1,322 @@
+# app/services/database_service.py
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r'\w+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    posting_key TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    salary TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    skills TEXT NOT NULL DEFAULT '[]',
+    taxonomy_version TEXT NOT NULL DEFAULT '',
+    fetched_at REAL NOT NULL,
+    ingested INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_fetched_at ON jobs (fetched_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, description, content='jobs', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO jobs_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS job_skills (
+    skill_id INTEGER NOT NULL REFERENCES skills (id),
+    job_id INTEGER NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    PRIMARY KEY (skill_id, job_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS job_skills_job ON job_skills (job_id);
+"""
+
+def sqlite_path(database_url: str) -> Optional[str]:
+    """Filesystem path of a sqlite:/// URL ('sqlite:///./hackathon.db' -> './hackathon.db'), else None"""
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        return None
+    return database_url[len(prefix):] or ":memory:"
+
+def _match_all(text: str, column: Optional[str] = None) -> Optional[str]:
+    """FTS5 query requiring every word of text, each quoted so user input can't inject query syntax"""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    if column:
+        return f"{column} : ({' AND '.join(terms)})"
+    return " AND ".join(terms)
+
+class JobStore:
+    """Job postings persisted in SQLite, full-text indexed (FTS5) over title and description.
+
+    Postings are stored with the skills extracted from them, both as a JSON
+    list for rebuilding search results and through a skill/job join table for
+    queries by skill. A posting is identified by its URL (or, without one, a
+    hash of its content), so re-fetching it updates the row in place.
+    Bulk-loaded (ingested) postings never age out of searches, and rows
+    extracted under an older taxonomy are re-extracted when a search hits them.
+
+    sqlite3 calls block; async callers run them through asyncio.to_thread.
+    One connection is shared under a lock.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._unavailable = path is None
+
+    @property
+    def enabled(self) -> bool:
+        return not self._unavailable
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._connection is None and not self._unavailable:
+            try:
+                connection = sqlite3.connect(self.path, check_same_thread=False)
+                connection.row_factory = sqlite3.Row
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                connection.execute("PRAGMA foreign_keys=ON")
+                connection.executescript(SCHEMA)
+                self._migrate(connection)
+                self._connection = connection
+            except sqlite3.Error as e:
+                # e.g. an SQLite build without FTS5; searches then always go to the sources
+                logger.error("Job store disabled, could not open %s: %s", self.path, e)
+                self._unavailable = True
+        return self._connection
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection) -> None:
+        """Add columns missing from a jobs table created by an older version"""
+        columns = {row['name'] for row in connection.execute("PRAGMA table_info(jobs)")}
+        if 'ingested' not in columns:
+            with connection:
+                connection.execute("ALTER TABLE jobs ADD COLUMN ingested INTEGER NOT NULL DEFAULT 0")
+
+    @staticmethod
+    def _posting_key(posting: Dict) -> str:
+        if posting.get('url'):
+            return posting['url']
+        content = "\x1f".join(posting.get(field) or '' for field in ('source', 'title', 'company', 'description'))
+        return "sha1:" + hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def upsert_postings(self, postings: List[Dict], taxonomy_version: str, ingested: bool = False) -> int:
+        """Insert or refresh postings (each with a 'skills_required' list); returns how many were new to the store.
+
+        Postings sharing a key are written once, the last one winning. Once a
+        posting has been ingested it stays exempt from the search max age.
+        """
+        postings = list({self._posting_key(posting): posting for posting in postings}.items())
+        with self._lock:
+            connection = self._connect()
+            if connection is None or not postings:
+                return 0
+
+            now = time.time()
+            inserted = 0
+            with connection:
+                # Rowids are assigned past the current maximum, so a returned id above it is a new row
+                max_id = connection.execute("SELECT IFNULL(MAX(id), 0) FROM jobs").fetchone()[0]
+                skill_ids = self._skill_ids(connection, {
+                    skill for _, posting in postings for skill in posting.get('skills_required', [])
+                })
+                for posting_key, posting in postings:
+                    skills = posting.get('skills_required', [])
+                    job_id = connection.execute(
+                        """
+                        INSERT INTO jobs (posting_key, source, title, company, location, description,
+                                          salary, url, skills, taxonomy_version, fetched_at, ingested)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (posting_key) DO UPDATE SET
+                            source = excluded.source, title = excluded.title, company = excluded.company,
+                            location = excluded.location, description = excluded.description,
+                            salary = excluded.salary, url = excluded.url, skills = excluded.skills,
+                            taxonomy_version = excluded.taxonomy_version, fetched_at = excluded.fetched_at,
+                            ingested = MAX(ingested, excluded.ingested)
+                        RETURNING id
+                        """,
+                        (
+                            posting_key,
+                            posting.get('source') or '',
+                            posting.get('title') or '',
+                            posting.get('company') or '',
+                            posting.get('location') or '',
+                            posting.get('description') or '',
+                            posting.get('salary') or '',
+                            posting.get('url') or '',
+                            json.dumps(skills),
+                            taxonomy_version,
+                            now,
+                            int(ingested)
+                        )
+                    ).fetchone()[0]
+                    inserted += job_id > max_id
+                    self._link_skills(connection, job_id, skills, skill_ids)
+            return inserted
+
+    @staticmethod
+    def _link_skills(connection: sqlite3.Connection, job_id: int, skills: List[str], skill_ids: Dict[str, int]) -> None:
+        connection.execute("DELETE FROM job_skills WHERE job_id = ?", (job_id,))
+        connection.executemany(
+            "INSERT OR IGNORE INTO job_skills (skill_id, job_id) VALUES (?, ?)",
+            [(skill_ids[skill], job_id) for skill in skills]
+        )
+
+    @staticmethod
+    def _skill_ids(connection: sqlite3.Connection, skills: set) -> Dict[str, int]:
+        connection.executemany("INSERT OR IGNORE INTO skills (name) VALUES (?)", [(skill,) for skill in skills])
+        ids = {}
+        for skill in skills:
+            ids[skill] = connection.execute("SELECT id FROM skills WHERE name = ?", (skill,)).fetchone()[0]
+        return ids
+
+    def search_postings(
+        self,
+        job_title: str,
+        location: str,
+        limit: int,
+        max_age: float,
+        taxonomy_version: str,
+        extract: Callable[[str], List[str]]
+    ) -> List[Dict]:
+        """Fresh postings whose title contains every word of job_title, best title match first.
+
+        Postings in the requested location rank ahead of others; scraped rows
+        older than max_age seconds are skipped. Rows extracted under another
+        taxonomy get their skills re-extracted with extract and saved.
+        """
+        query = _match_all(job_title, column='title')
+        with self._lock:
+            connection = self._connect()
+            if connection is None or query is None:
+                return []
+            rows = connection.execute(
+                """
+                SELECT jobs.* FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid
+                WHERE jobs_fts MATCH ? AND (jobs.ingested OR jobs.fetched_at >= ?)
+                ORDER BY (jobs.location LIKE ?) DESC, bm25(jobs_fts), jobs.fetched_at DESC
+                LIMIT ?
+                """,
+                (query, time.time() - max_age, f"%{location or ''}%", limit)
+            ).fetchall()
+            postings = [self._row_to_posting(row) for row in rows]
+            stale = [
+                (row['id'], posting, row['description'])
+                for row, posting in zip(rows, postings)
+                if row['taxonomy_version'] != taxonomy_version
+            ]
+            if stale:
+                self._reextract(connection, stale, taxonomy_version, extract)
+        return postings
+
+    @staticmethod
+    def _reextract(
+        connection: sqlite3.Connection,
+        stale: List[Tuple[int, Dict, str]],
+        taxonomy_version: str,
+        extract: Callable[[str], List[str]]
+    ) -> None:
+        """Re-extract the skills of (job id, posting, description) rows under taxonomy_version, in place"""
+        for _, posting, description in stale:
+            posting['skills_required'] = extract(description)
+        with connection:
+            skill_ids = JobStore._skill_ids(connection, {
+                skill for _, posting, _ in stale for skill in posting['skills_required']
+            })
+            for job_id, posting, _ in stale:
+                connection.execute(
+                    "UPDATE jobs SET skills = ?, taxonomy_version = ? WHERE id = ?",
+                    (json.dumps(posting['skills_required']), taxonomy_version, job_id)
+                )
+                JobStore._link_skills(connection, job_id, posting['skills_required'], skill_ids)
+
+    def find_postings(self, text: Optional[str] = None, skill: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Postings matching free text in title or description and/or requiring a skill, most relevant first"""
+        query = _match_all(text) if text else None
+        clauses, params = [], []
+        source = "jobs"
+        order = "jobs.fetched_at DESC"
+        if query is not None:
+            source = "jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid"
+            clauses.append("jobs_fts MATCH ?")
+            params.append(query)
+            order = "bm25(jobs_fts), jobs.fetched_at DESC"
+        if skill:
+            clauses.append(
+                "jobs.id IN (SELECT job_id FROM job_skills JOIN skills ON skills.id = job_skills.skill_id"
+                " WHERE skills.name = ?)"
+            )
+            params.append(skill)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return []
+            rows = connection.execute(
+                f"SELECT jobs.* FROM {source} {where} ORDER BY {order} LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        return [self._row_to_posting(row) for row in rows]
+
+    @staticmethod
+    def _row_to_posting(row: sqlite3.Row) -> Dict:
+        return {
+            'title': row['title'],
+            'company': row['company'],
+            'location': row['location'],
+            'skills_required': json.loads(row['skills']),
+            'url': row['url'],
+            'salary': row['salary'],
+            'source': row['source'],
+            'fetched_at': row['fetched_at']
+        }
+
+    def stats(self) -> Dict:
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return {"enabled": False}
+            jobs, oldest, newest = connection.execute(
+                "SELECT COUNT(*), MIN(fetched_at), MAX(fetched_at) FROM jobs"
+            ).fetchone()
+            skills = connection.execute("SELECT COUNT(*) FROM skills").fetchone()[0]
+        return {"enabled": True, "path": self.path, "jobs": jobs, "skills": skills, "oldest": oldest, "newest": newest}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+job_store = JobStore(sqlite_path(settings.DATABASE_URL) if settings.JOB_STORE_ENABLED else None)
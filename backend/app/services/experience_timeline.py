@@ -0,0 +1,161 @@
+# app/services/experience_timeline.py
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from app.services.resume_scanner import Section
+from app.services.skill_taxonomy import get_taxonomy
+from app.services.text_normalizer import NormalizedText
+
+MONTHS = {
+    'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8, 'sep': 9, 'sept': 9, 'september': 9,
+    'oct': 10, 'october': 10, 'nov': 11, 'november': 11, 'dec': 12, 'december': 12
+}
+SEASONS = {'spring': 3, 'summer': 6, 'fall': 9, 'autumn': 9, 'winter': 12}
+
+_YEAR = r'(?:19|20)\d{2}'
+
+def _date_pattern(prefix: str) -> str:
+    """One date (month-name, season, MM/YYYY or bare year), with group names under prefix"""
+    month_names = '|'.join(sorted(MONTHS, key=len, reverse=True))
+    seasons = '|'.join(SEASONS)
+    return (
+        rf'(?:(?P<{prefix}month>{month_names})\.?,?\s+(?P<{prefix}month_year>{_YEAR})'
+        rf'|(?P<{prefix}season>{seasons})\s+(?P<{prefix}season_year>{_YEAR})'
+        rf'|(?P<{prefix}number>0?[1-9]|1[0-2])/(?P<{prefix}number_year>{_YEAR})'
+        rf'|(?P<{prefix}year>{_YEAR}))'
+    )
+
+# 'Jan 2019 – Present', '2017-2020', '03/2018 to 06/2020', 'Summer 2021 - Fall 2021'
+_DATE_RANGE = re.compile(
+    r'(?<![\w/])' + _date_pattern('s_') +
+    r'\s*(?:-|–|—|to|until|through|thru)\s*'
+    r'(?:' + _date_pattern('e_') + r'|(?P<present>present|current|now|today|date))(?![\w/])'
+)
+
+MAX_SPAN_MONTHS = 50 * 12
+
+# Lines naming a degree or school; their date ranges are study, not employment
+_EDUCATION_CUE = re.compile(
+    r"\b(?:university|college|degree|diploma|bachelor\w*|master's|masters|graduat\w*|gpa"
+    r"|ph\.?d|mba|b\.?sc|m\.?sc|b\.s|m\.s|b\.a|m\.a|b\.?eng|m\.?eng|b\.?tech|m\.?tech)\b"
+)
+
+def _month_index(match: re.Match, prefix: str, end: bool = False) -> int:
+    """Months since year 0 for one side of a range.
+
+    A bare year counts from January as a start and through December as an
+    end, so '2017 - 2020' is four years.
+    """
+    group = match.group
+    if group(prefix + 'month'):
+        return int(group(prefix + 'month_year')) * 12 + MONTHS[group(prefix + 'month')] - 1
+    if group(prefix + 'season'):
+        return int(group(prefix + 'season_year')) * 12 + SEASONS[group(prefix + 'season')] - 1
+    if group(prefix + 'number'):
+        return int(group(prefix + 'number_year')) * 12 + int(group(prefix + 'number')) - 1
+    return int(group(prefix + 'year')) * 12 + (11 if end else 0)
+
+def _format_month(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+def merge_spans(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge overlapping or back-to-back (start, end) month spans, inclusive at both ends"""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def _span_months(spans: List[Tuple[int, int]]) -> int:
+    return sum(end - start + 1 for start, end in merge_spans(spans))
+
+def _on_education_line(block: str, match: re.Match) -> bool:
+    line_start = block.rfind('\n', 0, match.start()) + 1
+    line_end = block.find('\n', match.end())
+    return _EDUCATION_CUE.search(block, line_start, len(block) if line_end == -1 else line_end) is not None
+
+def extract_timeline(document: NormalizedText, sections: List[Section], today: Optional[date] = None) -> Dict:
+    """Employment spans from the experience section, total years, and per-skill years and recency.
+
+    Each date range owns the text up to the next range (or the end of its
+    section), and every skill mentioned there is credited with that span. A
+    skill's years come from its merged spans, so two overlapping jobs that
+    both used Python count once. sections are the scan stage's headings.
+    Resumes without an experience heading are scanned outside their other
+    sections (whole, if there are none), skipping date ranges on lines that
+    name a degree or school. Span offsets point into the original text.
+    """
+    today = today or date.today()
+    current = today.year * 12 + today.month - 1
+
+    text = document.text
+    blocks = [(section.start, section.end) for section in sections if section.name == 'experience']
+    unheaded = not blocks
+    if unheaded:
+        # No experience heading (e.g. 'Professional Background'): everything but the education, skills, ... sections
+        blocks = []
+        position = 0
+        for section in sections:
+            if section.start > position:
+                blocks.append((position, section.start))
+            position = section.end
+        if position < len(text):
+            blocks.append((position, len(text)))
+
+    matcher = get_taxonomy().matcher
+    spans: List[Dict] = []
+    bounds: List[Tuple[int, int]] = []
+    skill_spans: Dict[str, List[Tuple[int, int]]] = {}
+
+    for block_start, block_end in blocks:
+        block = text[block_start:block_end]
+        ranges = []
+        for match in _DATE_RANGE.finditer(block):
+            start = _month_index(match, 's_')
+            end = current if match.group('present') else _month_index(match, 'e_', end=True)
+            if end > current:
+                end = current
+            if start > end or start > current or end - start > MAX_SPAN_MONTHS:
+                continue
+            # Kept as a boundary so the range before it doesn't own the education line's text
+            ranges.append((match, start, end, unheaded and _on_education_line(block, match)))
+
+        for position, (match, start, end, education) in enumerate(ranges):
+            if education:
+                continue
+            owned_end = ranges[position + 1][0].start() if position + 1 < len(ranges) else len(block)
+            skills = list(dict.fromkeys(skill.skill for skill in matcher.find_all(block[match.start():owned_end])))
+            for skill in skills:
+                skill_spans.setdefault(skill, []).append((start, end))
+            bounds.append((start, end))
+            spans.append({
+                "start": _format_month(start),
+                "end": "present" if match.group('present') else _format_month(end),
+                "months": end - start + 1,
+                "text_start": document.original_start(block_start + match.start()),
+                "text_end": document.original_end(block_start + owned_end),
+                "skills": skills
+            })
+
+    skill_years = {}
+    for skill, skill_bounds in skill_spans.items():
+        months = _span_months(skill_bounds)
+        last_used = max(end for _, end in skill_bounds)
+        skill_years[skill] = {
+            "months": months,
+            "years": round(months / 12, 1),
+            "last_used": "present" if last_used == current else _format_month(last_used)
+        }
+
+    total_months = _span_months(bounds)
+    return {
+        "spans": spans,
+        "total_months": total_months,
+        "total_years": round(total_months / 12, 1),
+        "skills": skill_years
+    }
@@ -0,0 +1,242 @@
+# app/services/job_ingest_service.py
+"""Bulk-load job postings from JSONL or CSV dumps into the job store.
+
+    python -m app.services.job_ingest_service postings.jsonl.gz --workers 8
+
+Postings stream through parse -> normalize -> skill-extract -> batched
+upsert, so memory stays bounded however large the dump is. The first
+three stages run in worker processes on batches of raw lines; the main
+process only reads and writes. Repeats are collapsed by the job store's
+unique posting key, the same way a re-fetched posting is. Ingested
+postings are marked as such and don't age out of /jobs searches.
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import logging
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+from app.services.database_service import JobStore, job_store
+from app.services.job_sources import html_to_text
+from app.services.skill_taxonomy import get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_BATCH_SIZE = 1000
+COMMIT_BATCH_SIZE = 20000
+
+# Column/key names seen in common dumps and board APIs, per posting field
+FIELD_ALIASES = {
+    'title': ('title', 'job_title', 'text', 'name', 'position'),
+    'company': ('company', 'company_name', 'employer', 'organization'),
+    'location': ('location', 'job_location', 'city', 'locations'),
+    'description': ('description', 'descriptionPlain', 'content', 'body', 'job_description', 'summary'),
+    'salary': ('salary', 'salary_range', 'compensation', 'pay'),
+    'url': ('url', 'absolute_url', 'hostedUrl', 'link', 'job_url', 'apply_url'),
+    'source': ('source', 'board', 'site')
+}
+
+def open_dump(path: str) -> TextIO:
+    """Open a dump for streaming text reads; '-' is stdin and a .gz suffix is decompressed on the fly"""
+    if path == '-':
+        return io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace', newline='')
+    return open(path, encoding='utf-8', errors='replace', newline='')
+
+def detect_format(path: str) -> str:
+    name = path[:-3] if path.endswith('.gz') else path
+    return 'csv' if name.lower().endswith('.csv') else 'jsonl'
+
+RawRecord = Union[str, Dict]
+
+def read_records(stream: TextIO, file_format: str) -> Iterator[RawRecord]:
+    """Yield one raw record per posting: a JSONL line, left for a worker to parse, or a CSV row"""
+    if file_format == 'csv':
+        # Descriptions can be long; the default 128 KB field limit rejects real dumps
+        csv.field_size_limit(16 * 1024 * 1024)
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if not line.isspace():
+            yield line
+
+def parse_record(raw: RawRecord) -> Optional[Dict]:
+    """A raw record as a dict, or None for a malformed JSONL line"""
+    if isinstance(raw, dict):
+        return raw
+    try:
+        record = json.loads(raw)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+def normalize_posting(record: Dict, default_source: str = 'ingest') -> Optional[Dict]:
+    """Map a raw record onto the posting fields, or None if it has no title"""
+    posting = {}
+    for field, aliases in FIELD_ALIASES.items():
+        value = next((record[alias] for alias in aliases if record.get(alias)), '')
+        if isinstance(value, dict):
+            value = value.get('name') or value.get('text') or ''
+        elif isinstance(value, list):
+            value = ", ".join(str(item) for item in value)
+        posting[field] = str(value).strip()
+    if not posting['title']:
+        return None
+    posting['description'] = html_to_text(posting['description'])
+    posting['source'] = posting['source'] or default_source
+    return posting
+
+def _batched(items: Iterable[RawRecord], size: int) -> Iterator[List[RawRecord]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _process_batch(raw_records: List[RawRecord], source: str) -> Tuple[str, List[Dict], int]:
+    """Parse, normalize and skill-extract a batch (runs in a worker process).
+
+    Returns the taxonomy version used, the postings, and how many records were invalid.
+    """
+    taxonomy = get_taxonomy()
+    postings = []
+    for raw in raw_records:
+        record = parse_record(raw)
+        posting = normalize_posting(record, source) if record is not None else None
+        if posting is not None:
+            posting['skills_required'] = taxonomy.matcher.extract_unique(posting['description'])
+            postings.append(posting)
+    return taxonomy.version, postings, len(raw_records) - len(postings)
+
+def process_batches(
+    batches: Iterable[List[RawRecord]],
+    source: str,
+    workers: int
+) -> Iterator[Tuple[str, List[Dict], int]]:
+    """_process_batch over every batch, across worker processes when workers > 1.
+
+    At most two batches per worker are in flight, so a fast reader can't
+    queue up the whole dump in memory. Results come back in input order.
+    """
+    if workers <= 1:
+        for batch in batches:
+            yield _process_batch(batch, source)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Future] = deque()
+        for batch in batches:
+            pending.append(executor.submit(_process_batch, batch, source))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def ingest_postings(
+    path: str,
+    file_format: Optional[str] = None,
+    store: JobStore = job_store,
+    workers: int = 1,
+    commit_size: int = COMMIT_BATCH_SIZE,
+    source: str = 'ingest',
+    progress: Optional[Callable[[Dict], None]] = None,
+    progress_interval: float = 5.0
+) -> Dict:
+    """Stream a JSONL or CSV dump into the job store and return throughput stats.
+
+    progress, if given, is called with the running stats at most every
+    progress_interval seconds. Each commit_size postings are written in one
+    transaction. 'inserted' counts postings new to the store and 'updated'
+    the rest: repeats within the dump and postings the store already held.
+    """
+    if not store.enabled:
+        raise RuntimeError("Job store is disabled (JOB_STORE_ENABLED / DATABASE_URL)")
+
+    file_format = file_format or detect_format(path)
+    counts = {'read': 0, 'invalid': 0, 'written': 0, 'inserted': 0}
+    started = time.monotonic()
+    last_report = started
+
+    def stats() -> Dict:
+        elapsed = time.monotonic() - started
+        return {
+            **counts,
+            'updated': counts['written'] - counts['inserted'],
+            'seconds': round(elapsed, 2),
+            'rows_per_sec': round(counts['read'] / elapsed, 1) if elapsed else 0.0
+        }
+
+    def write(postings: List[Dict], version: str) -> None:
+        counts['inserted'] += store.upsert_postings(postings, version, ingested=True)
+        counts['written'] += len(postings)
+
+    def counted(records: Iterable[RawRecord]) -> Iterator[RawRecord]:
+        for record in records:
+            counts['read'] += 1
+            yield record
+
+    with open_dump(path) as stream:
+        batches = _batched(counted(read_records(stream, file_format)), EXTRACT_BATCH_SIZE)
+        pending: List[Dict] = []
+        pending_version = None
+        for version, postings, invalid in process_batches(batches, source, workers):
+            counts['invalid'] += invalid
+            if pending and version != pending_version:
+                # The taxonomy was reloaded mid-run; don't store postings under the wrong version
+                write(pending, pending_version)
+                pending = []
+            pending_version = version
+            pending.extend(postings)
+            if len(pending) >= commit_size:
+                write(pending, pending_version)
+                pending = []
+
+            now = time.monotonic()
+            if progress is not None and now - last_report >= progress_interval:
+                progress(stats())
+                last_report = now
+
+        if pending:
+            write(pending, pending_version)
+
+    return stats()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-load job postings from a JSONL or CSV dump into the job store")
+    parser.add_argument('path', help="dump to read (.jsonl, .ndjson, .csv, optionally .gz; '-' for stdin)")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), help="override the format implied by the file name")
+    parser.add_argument('--workers', type=int, default=1, help="skill-extraction worker processes")
+    parser.add_argument('--commit-size', type=int, default=COMMIT_BATCH_SIZE, help="postings per transaction")
+    parser.add_argument('--source', default='ingest', help="source name for postings that don't carry one")
+    parser.add_argument('--database', help="SQLite file to load into instead of DATABASE_URL")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    store = JobStore(args.database) if args.database else job_store
+    result = ingest_postings(
+        args.path,
+        file_format=args.format,
+        store=store,
+        workers=args.workers,
+        commit_size=args.commit_size,
+        source=args.source,
+        progress=lambda running: logger.info(
+            "read %(read)d, inserted %(inserted)d, updated %(updated)d, invalid %(invalid)d"
+            " - %(rows_per_sec).0f rows/s", running
+        )
+    )
+    store.close()
+    print(json.dumps(result))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
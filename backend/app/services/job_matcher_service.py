@@ -0,0 +1,95 @@
+# app/services/job_matcher_service.py
+from typing import Dict, List, Sequence
+import numpy as np
+from app.services.skill_taxonomy import SkillTaxonomy, decode_vector
+
+# Bit i of byte value v, for every v in 0..255
+_BYTE_BITS = np.unpackbits(
+    np.arange(256, dtype=np.uint8)[:, None], axis=1, bitorder="little"
+).astype(np.float32)
+
+class JobMatcherService:
+
+    @staticmethod
+    def pack_vectors(vectors: Sequence[int], skill_count: int) -> np.ndarray:
+        """Lay skill bitmaps out as a (documents x bytes) uint8 matrix without unpacking the bits"""
+        width = max(1, (skill_count + 7) // 8)
+        return np.frombuffer(
+            b"".join(vector.to_bytes(width, "little") for vector in vectors),
+            dtype=np.uint8
+        ).reshape(len(vectors), width)
+
+    @staticmethod
+    def _weighted_popcount(packed: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Sum of weights[bit] over the set bits of every row, via one 256-entry lookup table per byte column"""
+        width = packed.shape[1]
+        byte_weights = _BYTE_BITS @ weights.reshape(width, 8).T
+        totals = np.zeros(packed.shape[0], dtype=np.float32)
+        for column in range(width):
+            totals += byte_weights[packed[:, column], column]
+        return totals
+
+    @staticmethod
+    def score_postings(user_vector: int, posting_vectors: Sequence[int], skill_count: int) -> np.ndarray:
+        """Score every posting against one resume at once.
+
+        Each posting's required skills are weighted by inverse document frequency
+        across the corpus, so a rare requirement the candidate covers counts for
+        more than one every posting lists. The score is the weighted share of a
+        posting's requirements the candidate has, in [0, 1].
+
+        Everything runs on the packed bitmaps, so a 100k-posting corpus is a
+        few MB of uint8 rather than a dense float matrix.
+        """
+        packed = JobMatcherService.pack_vectors(posting_vectors, skill_count)
+        width = packed.shape[1]
+
+        # Per-skill document frequency from per-byte histograms
+        byte_counts = np.stack([
+            np.bincount(packed[:, column], minlength=256) for column in range(width)
+        ]).astype(np.float32)
+        document_frequency = (byte_counts @ _BYTE_BITS).reshape(-1)
+
+        idf = (np.log((1 + len(posting_vectors)) / (1 + document_frequency)) + 1).astype(np.float32)
+        idf[skill_count:] = 0
+
+        user_bits = JobMatcherService.pack_vectors([user_vector], skill_count)
+        user_mask = np.unpackbits(user_bits[0], bitorder="little").astype(np.float32)
+
+        required_weight = JobMatcherService._weighted_popcount(packed, idf)
+        covered_weight = JobMatcherService._weighted_popcount(packed, idf * user_mask)
+        return np.divide(
+            covered_weight,
+            required_weight,
+            out=np.zeros_like(covered_weight),
+            where=required_weight > 0
+        )
+
+    @staticmethod
+    def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k best scores, best first, without sorting the whole array"""
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.array([], dtype=np.intp)
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    @staticmethod
+    def rank_postings(user_vector: int, postings: List[Dict], taxonomy: SkillTaxonomy, top_k: int = 10) -> List[Dict]:
+        """Return the top_k postings for a resume, each annotated with its score and skill overlap"""
+        if not postings:
+            return []
+
+        posting_vectors = [decode_vector(posting.get('skill_vector', '')) for posting in postings]
+        scores = JobMatcherService.score_postings(user_vector, posting_vectors, len(taxonomy.skills))
+
+        ranked = []
+        for index in JobMatcherService.top_k(scores, top_k):
+            posting_vector = posting_vectors[index]
+            ranked.append({
+                **postings[index],
+                'match_score': round(float(scores[index]) * 100, 1),
+                'matching_skills': taxonomy.from_vector(posting_vector & user_vector),
+                'missing_skills': taxonomy.from_vector(posting_vector & ~user_vector)
+            })
+        return ranked
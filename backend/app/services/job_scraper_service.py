@@ -1,35 +1,61 @@
 # app/services/job_scraper_service.py
-import requests
-import re
-from typing import Dict, List, Optional
 import asyncio
-import aiohttp
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.config import settings
+from app.services.database_service import job_store
+from app.services.job_search_cache import job_search_cache
+from app.services.job_sources import MOCK_SOURCE, JobSourcePool, build_sources
+from app.services.skill_taxonomy import SkillTaxonomy, encode_vector, get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+# Background job store writes, referenced until done so they aren't garbage collected mid-write
+_pending_writes: Set[asyncio.Task] = set()
+
+def _finish_write(task: asyncio.Task) -> None:
+    _pending_writes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Storing job postings failed: %s", task.exception())
 
 class JobScraperService:
     
     @staticmethod
     async def search_jobs(job_title: str, location: str = "United States", limit: int = 10) -> Dict:
-        """Search for jobs and extract requirements"""
+        """Search for jobs and extract requirements, served from the search cache when possible"""
+        return await job_search_cache.get_or_fetch(
+            job_search_cache.make_key(job_title, location, limit),
+            lambda: JobScraperService._search_jobs_uncached(job_title, location, limit)
+        )
+    
+    @staticmethod
+    async def _search_jobs_uncached(job_title: str, location: str, limit: int) -> Dict:
+        """Serve the search from the job store if it holds enough fresh postings, else query the job sources"""
         try:
-            # Use multiple job APIs for better coverage
-            results = await JobScraperService._search_multiple_sources(job_title, location, limit)
+            taxonomy = get_taxonomy()
             
-            # Extract skills from all job descriptions
-            all_skills = []
             job_summaries = []
+            if job_store.enabled:
+                job_summaries = await asyncio.to_thread(
+                    job_store.search_postings, job_title, location, limit,
+                    settings.JOB_STORE_MAX_AGE_SECONDS, taxonomy.version, taxonomy.matcher.extract_unique
+                )
             
-            for job in results:
-                extracted_skills = JobScraperService._extract_job_requirements(job.get('description', ''))
-                all_skills.extend(extracted_skills)
+            if job_summaries and len(job_summaries) >= limit:
+                source_report = {"job_store": {"jobs": len(job_summaries)}}
+                await asyncio.to_thread(JobScraperService._add_skill_vectors, job_summaries, taxonomy)
+            else:
+                # Use multiple job APIs for better coverage
+                results, source_report = await JobScraperService._search_multiple_sources(job_title, location, limit)
+                
+                # Extract skills from all job descriptions; a large result set takes a while, so off the event loop
+                job_summaries = await asyncio.to_thread(JobScraperService._summarize_jobs, results, taxonomy)
                 
-                job_summaries.append({
-                    'title': job.get('title', ''),
-                    'company': job.get('company', ''),
-                    'location': job.get('location', ''),
-                    'skills_required': extracted_skills,
-                    'url': job.get('url', ''),
-                    'salary': job.get('salary', '')
-                })
+                if job_store.enabled:
+                    JobScraperService._store_postings_later(results, job_summaries, taxonomy)
+            
+            all_skills = [skill for summary in job_summaries for skill in summary['skills_required']]
             
             # Aggregate skills and count frequency
             skill_frequency = JobScraperService._count_skill_frequency(all_skills)
@@ -39,24 +65,61 @@ class JobScraperService:
                 'jobs_found': len(job_summaries),
                 'job_summaries': job_summaries,
                 'top_skills_required': skill_frequency,
-                'total_skills_mentioned': len(all_skills)
+                'total_skills_mentioned': len(all_skills),
+                'taxonomy_version': taxonomy.version,
+                'sources': source_report
             }
             
         except Exception as e:
             return {"error": f"Failed to scrape jobs: {str(e)}"}
     
     @staticmethod
-    async def _search_multiple_sources(job_title: str, location: str, limit: int) -> List[Dict]:
-        """Search multiple job sources (simplified for hackathon)"""
-        jobs = []
-        
-        # For hackathon speed, we'll create mock data that represents real job requirements
-        # In production, you'd use actual APIs like Indeed, LinkedIn, etc.
-        
-        mock_jobs = JobScraperService._generate_realistic_job_data(job_title, location, limit)
-        jobs.extend(mock_jobs)
-        
-        return jobs[:limit]
+    def _summarize_jobs(results: List[Dict], taxonomy: SkillTaxonomy) -> List[Dict]:
+        """Job summaries with the skills extracted from each posting's description"""
+        job_summaries = []
+        for job in results:
+            extracted_skills = JobScraperService._extract_job_requirements(job.get('description', ''))
+            job_summaries.append({
+                'title': job.get('title', ''),
+                'company': job.get('company', ''),
+                'location': job.get('location', ''),
+                'skills_required': extracted_skills,
+                'skill_vector': encode_vector(taxonomy.to_vector(extracted_skills)),
+                'url': job.get('url', ''),
+                'salary': job.get('salary', ''),
+                'source': job.get('source', '')
+            })
+        return job_summaries
+    
+    @staticmethod
+    def _store_postings_later(results: List[Dict], job_summaries: List[Dict], taxonomy: SkillTaxonomy) -> None:
+        """Persist fetched postings (never the mock ones) in a background task, off the response path"""
+        postings = [
+            {**job, 'skills_required': summary['skills_required']}
+            for job, summary in zip(results, job_summaries)
+            if job.get('source') != MOCK_SOURCE
+        ]
+        if not postings:
+            return
+        task = asyncio.create_task(asyncio.to_thread(job_store.upsert_postings, postings, taxonomy.version))
+        _pending_writes.add(task)
+        task.add_done_callback(_finish_write)
+
+    @staticmethod
+    async def wait_for_pending_writes() -> None:
+        """Let background job store writes finish (called on application shutdown)"""
+        if _pending_writes:
+            await asyncio.gather(*_pending_writes, return_exceptions=True)
+
+    @staticmethod
+    def _add_skill_vectors(job_summaries: List[Dict], taxonomy: SkillTaxonomy) -> None:
+        for summary in job_summaries:
+            summary['skill_vector'] = encode_vector(taxonomy.to_vector(summary['skills_required']))
+    
+    @staticmethod
+    async def _search_multiple_sources(job_title: str, location: str, limit: int) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """Query every configured job source concurrently (see JOB_SOURCES); the mock data if none are set"""
+        return await job_sources.search(job_title, location, limit)
     
     @staticmethod
     def _generate_realistic_job_data(job_title: str, location: str, limit: int) -> List[Dict]:
@@ -145,50 +208,8 @@ class JobScraperService:
     @staticmethod
     def _extract_job_requirements(description: str) -> List[str]:
         """Extract technical skills from job description"""
-        description_lower = description.lower()
-        
-        # Use the same skill categories as resume parser for consistency
-        all_skills = [
-            # Programming Languages
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'c', 'go', 
-            'rust', 'swift', 'kotlin', 'scala', 'ruby', 'php', 'sql', 'html', 
-            'css', 'r', 'matlab', 'verilog', 'vhdl', 'systemverilog',
-            
-            # Frameworks & Libraries
-            'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask',
-            'spring', 'tensorflow', 'pytorch', 'keras', 'pandas', 'numpy',
-            'fastapi', 'next.js', 'svelte', 'bootstrap', 'tailwind', 'scikit-learn',
-            
-            # Databases
-            'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle',
-            'cassandra', 'dynamodb', 'elasticsearch',
-            
-            # Cloud & DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins',
-            'terraform', 'ansible', 'linux', 'git', 'github', 'gitlab',
-            'ci/cd', 'microservices', 'serverless',
-            
-            # Hardware Engineering
-            'vivado', 'quartus', 'modelsim', 'cadence', 'synopsys',
-            'fpga', 'asic', 'pcb design', 'xilinx', 'altera', 'embedded systems',
-            
-            # AI/ML
-            'machine learning', 'deep learning', 'neural networks', 'nlp',
-            'computer vision', 'artificial intelligence',
-            
-            # Web Technologies
-            'rest api', 'graphql', 'websockets', 'json', 'oauth', 'jwt',
-            
-            # Soft Skills
-            'agile', 'scrum', 'kanban', 'leadership', 'teamwork', 'communication'
-        ]
-        
-        found_skills = []
-        for skill in all_skills:
-            if skill in description_lower:
-                found_skills.append(skill)
-        
-        return found_skills
+        # Same compiled skill index as the resume parser for consistency
+        return get_taxonomy().matcher.extract_unique(description)
     
     @staticmethod
     def _count_skill_frequency(skills: List[str]) -> Dict[str, int]:
@@ -202,21 +223,35 @@ class JobScraperService:
         return sorted_skills
     
     @staticmethod
-    def get_skills_gap_analysis(user_skills: Dict, job_requirements: Dict) -> Dict:
+    def get_skills_gap_analysis(user_skills: Optional[Dict], job_requirements: Dict, user_skill_vector: int = 0) -> Dict:
         """Compare user skills against job market requirements"""
         
-        # Flatten user skills from resume
-        user_skill_list = []
-        for category, skills in user_skills.items():
-            user_skill_list.extend(skills)
+        taxonomy = get_taxonomy()
         
-        # Get required skills from job market
-        required_skills = set(job_requirements.keys())
-        user_skills_set = set(skill.lower() for skill in user_skill_list)
+        # Fold the user's skills into a bitmap; a vector from a parsed resume can be passed straight in
+        user_vector = user_skill_vector
+        user_untracked = set()
+        for category, skills in (user_skills or {}).items():
+            for skill in skills:
+                canonical = taxonomy.canonical(skill)
+                if canonical is None:
+                    user_untracked.add(skill.strip().lower())
+                else:
+                    user_vector |= 1 << taxonomy.skill_ids[canonical]
         
-        # Calculate gaps
-        missing_skills = required_skills - user_skills_set
-        matching_skills = required_skills & user_skills_set
+        # Compare on canonical skill ids so 'k8s' on a resume satisfies 'kubernetes' in a posting
+        job_requirements = JobScraperService._canonicalize_counts(job_requirements)
+        required_vector = taxonomy.to_vector(job_requirements)
+        
+        # Calculate gaps with bit operations instead of building string sets
+        matching_skills = taxonomy.from_vector(required_vector & user_vector)
+        missing_skills = taxonomy.from_vector(required_vector & ~user_vector)
+        
+        # Requirements outside the taxonomy can't live in the bitmap; compare those by name
+        for skill in job_requirements:
+            if skill not in taxonomy.skill_ids:
+                (matching_skills if skill in user_untracked else missing_skills).append(skill)
+        total_required = len(matching_skills) + len(missing_skills)
         
         # Prioritize missing skills by frequency
         prioritized_gaps = []
@@ -232,42 +267,40 @@ class JobScraperService:
         prioritized_gaps.sort(key=lambda x: x['frequency'], reverse=True)
         
         return {
-            'total_skills_required': len(required_skills),
+            'total_skills_required': total_required,
             'skills_you_have': len(matching_skills),
             'skills_missing': len(missing_skills),
-            'match_percentage': round((len(matching_skills) / len(required_skills)) * 100, 1) if required_skills else 0,
-            'matching_skills': list(matching_skills),
+            'match_percentage': round((len(matching_skills) / total_required) * 100, 1) if total_required else 0,
+            'matching_skills': matching_skills,
             'missing_skills': prioritized_gaps[:10],  # Top 10 gaps
             'skill_categories_to_focus': JobScraperService._categorize_missing_skills(prioritized_gaps[:10])
         }
     
+    @staticmethod
+    def _canonicalize_counts(skill_counts: Dict[str, int]) -> Dict[str, int]:
+        """Fold skill counts keyed by aliases onto their canonical skill"""
+        taxonomy = get_taxonomy()
+        canonical_counts: Dict[str, int] = {}
+        for skill, count in skill_counts.items():
+            key = taxonomy.canonical(skill) or skill.strip().lower()
+            canonical_counts[key] = canonical_counts.get(key, 0) + count
+        return canonical_counts
+    
     @staticmethod
     def _categorize_missing_skills(missing_skills: List[Dict]) -> Dict[str, List[str]]:
         """Categorize missing skills for focused learning"""
-        categories = {
-            'Programming Languages': [],
-            'Frameworks & Tools': [],
-            'Cloud & DevOps': [],
-            'Databases': [],
-            'Soft Skills': []
-        }
-        
-        for skill_info in missing_skills:
-            skill = skill_info['skill']
-            
-            if skill in ['python', 'java', 'javascript', 'typescript', 'c++', 'go', 'rust']:
-                categories['Programming Languages'].append(skill)
-            elif skill in ['aws', 'azure', 'docker', 'kubernetes', 'terraform']:
-                categories['Cloud & DevOps'].append(skill)
-            elif skill in ['mysql', 'postgresql', 'mongodb', 'redis']:
-                categories['Databases'].append(skill)
-            elif skill in ['agile', 'scrum', 'leadership', 'communication']:
-                categories['Soft Skills'].append(skill)
-            else:
-                categories['Frameworks & Tools'].append(skill)
-        
-        # Remove empty categories
-        return {k: v for k, v in categories.items() if v}
+        return JobScraperService._group_by_category(skill_info['skill'] for skill_info in missing_skills)
+    
+    @staticmethod
+    def _group_by_category(skills: Iterable[str]) -> Dict[str, List[str]]:
+        """Group skills under their primary taxonomy category label, omitting empty categories"""
+        taxonomy = get_taxonomy()
+        categories: Dict[str, List[str]] = {}
+        for skill in skills:
+            category = taxonomy.primary_category(skill)
+            label = taxonomy.category_label(category) if category else 'Other'
+            categories.setdefault(label, []).append(skill)
+        return categories
 
     @staticmethod
     def _generate_learning_recommendations(missing_skills: List[Dict]) -> List[str]:
@@ -288,30 +321,22 @@ class JobScraperService:
     @staticmethod
     def _identify_emerging_trends(skills: Dict[str, int]) -> List[str]:
         """Identify emerging technology trends"""
-        emerging = []
-        for skill, frequency in skills.items():
-            if skill in ['kubernetes', 'terraform', 'machine learning', 'ai', 'blockchain']:
-                emerging.append(skill)
-        return emerging[:3]
+        emerging = get_taxonomy().emerging
+        return [skill for skill in skills if skill in emerging][:3]
     
     @staticmethod
     def _categorize_skills(skills: List[str]) -> Dict[str, List[str]]:
         """Categorize skills for better understanding"""
-        categories = {
-            'Programming': [],
-            'Cloud/DevOps': [],
-            'Frameworks': [],
-            'Databases': []
-        }
-        
-        for skill in skills:
-            if skill in ['python', 'java', 'javascript', 'typescript']:
-                categories['Programming'].append(skill)
-            elif skill in ['aws', 'azure', 'docker', 'kubernetes']:
-                categories['Cloud/DevOps'].append(skill)
-            elif skill in ['react', 'angular', 'django', 'flask']:
-                categories['Frameworks'].append(skill)
-            elif skill in ['postgresql', 'mongodb', 'mysql']:
-                categories['Databases'].append(skill)
-        
-        return {k: v for k, v in categories.items() if v}
\ No newline at end of file
+        return JobScraperService._group_by_category(skills)
+
+job_sources = JobSourcePool(
+    build_sources(
+        settings.JOB_SOURCES,
+        timeout=settings.JOB_SOURCE_TIMEOUT_SECONDS,
+        greenhouse_url=settings.GREENHOUSE_API_URL,
+        lever_url=settings.LEVER_API_URL,
+        mock=JobScraperService._generate_realistic_job_data
+    ),
+    max_connections=settings.JOB_SOURCE_MAX_CONNECTIONS,
+    max_connections_per_host=settings.JOB_SOURCE_MAX_CONNECTIONS_PER_HOST
+)
@@ -0,0 +1,130 @@
+# app/services/job_search_cache.py
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Tuple
+from app.config import settings
+from app.services.singleflight import SingleFlight
+from app.services.skill_taxonomy import get_taxonomy
+
+SearchKey = Tuple[str, str, int, str]
+
+class JobSearchCache:
+    """LRU cache of job search results with a TTL and stale-while-revalidate.
+
+    A result younger than ttl is served as is. Between ttl and ttl + stale_ttl
+    it is still served, but a background task fetches a replacement, so a
+    popular query never waits on the job sources once it's warm. Older
+    entries are refetched in the foreground. Error results are never cached.
+    
+    Searches for more than max_limit postings (e.g. /jobs/match corpora) are
+    not cached: one entry would hold the whole corpus.
+    
+    Every fetch, foreground or background, goes through a SingleFlight keyed
+    like the cache, so a burst of identical searches on a cold key runs the
+    search once and stores it once, even if the caller that started it goes away.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, max_entries: int, max_limit: int):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_limit = max_limit
+        self._entries: "OrderedDict[SearchKey, Tuple[float, Dict]]" = OrderedDict()
+        self._flights = SingleFlight("job search")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.fetch_errors = 0
+        self.uncacheable = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    @staticmethod
+    def make_key(job_title: str, location: str, limit: int) -> SearchKey:
+        """Case- and whitespace-insensitive title and location, plus the taxonomy the skills were extracted with"""
+        return (
+            " ".join(job_title.lower().split()),
+            " ".join((location or "").lower().split()),
+            limit,
+            get_taxonomy().version
+        )
+
+    async def get_or_fetch(self, key: SearchKey, fetch: Callable[[], Awaitable[Dict]]) -> Dict:
+        """Return the cached result for key, fetching (or refreshing in the background) as its age requires.
+
+        The result is a shallow copy with a 'cache' field of 'hit', 'stale' or 'miss'.
+        With the cache disabled identical concurrent searches are still coalesced.
+        """
+        if not self.enabled:
+            return await self._flights.do(key, fetch)
+        if key[2] > self.max_limit:
+            self.uncacheable += 1
+            return await self._flights.do(key, fetch)
+
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None:
+            age = now - entry[0]
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return {**entry[1], 'cache': 'hit'}
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                if not self._flights.in_flight(key):
+                    self.refreshes += 1
+                    self._flights.start(key, lambda: self._fetch_and_store(key, fetch))
+                return {**entry[1], 'cache': 'stale'}
+
+        self.misses += 1
+        result = await self._flights.do(key, lambda: self._fetch_and_store(key, fetch))
+        return {**result, 'cache': 'miss'}
+
+    async def _fetch_and_store(self, key: SearchKey, fetch: Callable[[], Awaitable[Dict]]) -> Dict:
+        try:
+            result = await fetch()
+        except Exception:
+            self.fetch_errors += 1
+            raise
+        if "error" in result:
+            # Not cached; a stale entry keeps being served until it ages out
+            self.fetch_errors += 1
+            return result
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "max_limit": self.max_limit,
+            "ttl_seconds": self.ttl,
+            "stale_seconds": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "fetch_errors": self.fetch_errors,
+            "uncacheable": self.uncacheable,
+            **self._flights.stats()
+        }
+
+job_search_cache = JobSearchCache(
+    ttl=settings.JOB_SEARCH_CACHE_TTL_SECONDS,
+    stale_ttl=settings.JOB_SEARCH_CACHE_STALE_SECONDS,
+    max_entries=settings.JOB_SEARCH_CACHE_MAX_ENTRIES,
+    max_limit=settings.JOB_SEARCH_CACHE_MAX_LIMIT
+)
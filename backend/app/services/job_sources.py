@@ -0,0 +1,296 @@
+# app/services/job_sources.py
+import abc
+import asyncio
+import html
+import json
+import logging
+import re
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import aiohttp
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Every adapter returns postings in this shape, with 'source' naming the adapter
+JOB_FIELDS = ('title', 'company', 'location', 'description', 'salary', 'url')
+# Source name of the canned postings; they are never persisted to the job store
+MOCK_SOURCE = 'mock'
+
+_TAG = re.compile(r'<[^>]+>')
+_WORD = re.compile(r'\w+')
+
+def html_to_text(markup: str) -> str:
+    """Plain text of an HTML fragment; board APIs often escape the markup itself, hence two unescapes"""
+    text = _TAG.sub(' ', html.unescape(markup or ''))
+    return " ".join(html.unescape(text).split())
+
+def _title_matches(title: str, job_title: str) -> bool:
+    """Every word of the searched title appears in the posting's title ('engineer' matches 'Senior Engineer')"""
+    wanted = set(_WORD.findall(job_title.lower()))
+    return wanted <= set(_WORD.findall(title.lower()))
+
+class JobSource(abc.ABC):
+    """One place postings come from. fetch() returns at most limit postings matching job_title."""
+
+    def __init__(self, name: str, timeout: float):
+        self.name = name
+        self.timeout = timeout
+
+    @abc.abstractmethod
+    async def fetch(self, session: aiohttp.ClientSession, job_title: str, location: str, limit: int) -> List[Dict]:
+        """Postings from this source, each built with _posting()"""
+
+    def _posting(self, **fields) -> Dict:
+        posting = {field: fields.get(field) or '' for field in JOB_FIELDS}
+        posting['source'] = self.name
+        return posting
+
+class GreenhouseSource(JobSource):
+    """A Greenhouse job board (boards-api.greenhouse.io/v1/boards/{board}/jobs)"""
+
+    def __init__(self, board: str, base_url: str, timeout: float):
+        super().__init__(f"greenhouse:{board}", timeout)
+        self.board = board
+        self.url = f"{base_url.rstrip('/')}/v1/boards/{board}/jobs"
+
+    async def fetch(self, session: aiohttp.ClientSession, job_title: str, location: str, limit: int) -> List[Dict]:
+        async with session.get(self.url, params={"content": "true"}) as response:
+            response.raise_for_status()
+            payload = await response.json(content_type=None)
+
+        postings = []
+        for job in payload.get('jobs', []):
+            if not _title_matches(job.get('title', ''), job_title):
+                continue
+            postings.append(self._posting(
+                title=job.get('title'),
+                company=job.get('company_name') or self.board,
+                location=(job.get('location') or {}).get('name'),
+                description=html_to_text(job.get('content', '')),
+                url=job.get('absolute_url')
+            ))
+            if len(postings) >= limit:
+                break
+        return postings
+
+class LeverSource(JobSource):
+    """A Lever postings board (api.lever.co/v0/postings/{company})"""
+
+    def __init__(self, company: str, base_url: str, timeout: float):
+        super().__init__(f"lever:{company}", timeout)
+        self.company = company
+        self.url = f"{base_url.rstrip('/')}/v0/postings/{company}"
+
+    async def fetch(self, session: aiohttp.ClientSession, job_title: str, location: str, limit: int) -> List[Dict]:
+        async with session.get(self.url, params={"mode": "json", "limit": str(limit * 5)}) as response:
+            response.raise_for_status()
+            payload = await response.json(content_type=None)
+
+        postings = []
+        for job in payload:
+            if not _title_matches(job.get('text', ''), job_title):
+                continue
+            # Requirements usually live in the bullet lists, not the intro paragraph
+            sections = [job.get('descriptionPlain') or html_to_text(job.get('description', ''))]
+            sections.extend(html_to_text(item.get('content', '')) for item in job.get('lists', []))
+            postings.append(self._posting(
+                title=job.get('text'),
+                company=self.company,
+                location=(job.get('categories') or {}).get('location'),
+                description=" ".join(section for section in sections if section),
+                salary=self._salary(job.get('salaryRange') or {}),
+                url=job.get('hostedUrl')
+            ))
+            if len(postings) >= limit:
+                break
+        return postings
+
+    @staticmethod
+    def _salary(salary_range: Dict) -> str:
+        if 'min' not in salary_range or 'max' not in salary_range:
+            return ''
+        return f"{salary_range['min']:,} - {salary_range['max']:,} {salary_range.get('currency', '')}".strip()
+
+class RSSSource(JobSource):
+    """An RSS 2.0 job feed; item titles are matched against the search, descriptions are HTML"""
+
+    def __init__(self, url: str, timeout: float):
+        super().__init__(f"rss:{url}", timeout)
+        self.url = url
+
+    async def fetch(self, session: aiohttp.ClientSession, job_title: str, location: str, limit: int) -> List[Dict]:
+        async with session.get(self.url) as response:
+            response.raise_for_status()
+            body = await response.read()
+
+        parser = etree.XMLParser(resolve_entities=False, no_network=True)
+        channel = etree.fromstring(body, parser=parser).find('channel')
+        if channel is None:
+            return []
+        feed_title = channel.findtext('title', '')
+
+        postings = []
+        for item in channel.iterfind('item'):
+            title = item.findtext('title', '')
+            if not _title_matches(title, job_title):
+                continue
+            postings.append(self._posting(
+                title=title,
+                company=item.findtext('source') or feed_title,
+                location=item.findtext('location') or item.findtext('category'),
+                description=html_to_text(item.findtext('description', '')),
+                url=item.findtext('link')
+            ))
+            if len(postings) >= limit:
+                break
+        return postings
+
+class FixtureSource(JobSource):
+    """Postings from a local JSON file (a list of postings or {"jobs": [...]}), for demos and tests"""
+
+    def __init__(self, path: str, timeout: float):
+        super().__init__(f"fixture:{path}", timeout)
+        self.path = path
+
+    async def fetch(self, session: aiohttp.ClientSession, job_title: str, location: str, limit: int) -> List[Dict]:
+        payload = await asyncio.to_thread(self._load)
+        jobs = payload.get('jobs', []) if isinstance(payload, dict) else payload
+        return [
+            self._posting(**job) for job in jobs
+            if _title_matches(job.get('title', ''), job_title)
+        ][:limit]
+
+    def _load(self):
+        with open(self.path, encoding='utf-8') as fixture:
+            return json.load(fixture)
+
+class MockSource(JobSource):
+    """Canned postings from a generator function; used when no real sources are configured"""
+
+    def __init__(self, generate: Callable[[str, str, int], List[Dict]], timeout: float):
+        super().__init__(MOCK_SOURCE, timeout)
+        self.generate = generate
+
+    async def fetch(self, session: aiohttp.ClientSession, job_title: str, location: str, limit: int) -> List[Dict]:
+        return [self._posting(**job) for job in self.generate(job_title, location, limit)]
+
+def build_sources(
+    spec: str,
+    timeout: float,
+    greenhouse_url: str,
+    lever_url: str,
+    mock: Optional[Callable[[str, str, int], List[Dict]]] = None
+) -> List[JobSource]:
+    """Sources from a comma-separated spec such as 'greenhouse:acme,lever:initech,rss:https://x/feed,mock'.
+
+    An empty spec means the mock source alone.
+    """
+    sources: List[JobSource] = []
+    for entry in (part.strip() for part in spec.split(',')):
+        if not entry:
+            continue
+        kind, _, argument = entry.partition(':')
+        kind = kind.lower()
+        if kind == 'greenhouse' and argument:
+            sources.append(GreenhouseSource(argument, greenhouse_url, timeout))
+        elif kind == 'lever' and argument:
+            sources.append(LeverSource(argument, lever_url, timeout))
+        elif kind == 'rss' and argument:
+            sources.append(RSSSource(argument, timeout))
+        elif kind == 'fixture' and argument:
+            sources.append(FixtureSource(argument, timeout))
+        elif kind == 'mock' and mock is not None:
+            sources.append(MockSource(mock, timeout))
+        else:
+            raise ValueError(f"Invalid job source '{entry}'")
+    if not sources and mock is not None:
+        sources.append(MockSource(mock, timeout))
+    return sources
+
+class JobSourcePool:
+    """Queries job sources concurrently over one long-lived aiohttp session.
+
+    The session's connector caps connections overall and per host, and is
+    reused across searches so board APIs see keep-alive connections rather
+    than a TCP and TLS handshake per request. Each source gets its own
+    timeout; one that fails or times out is reported and skipped.
+    """
+
+    def __init__(self, sources: List[JobSource], max_connections: int, max_connections_per_host: int):
+        self.sources = sources
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        # A session is bound to the loop it was made on; tests may run each request on a fresh loop
+        if self._session is not None and self._session_loop is not loop:
+            await self.close()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_connections_per_host
+                ),
+                headers={"Accept": "application/json, application/rss+xml, */*"}
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def search(self, job_title: str, location: str, limit: int) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """Postings from every source, merged as each source answers, plus a per-source report.
+
+        A posting another source already returned (same URL) is dropped. Once
+        limit postings are in hand the sources still outstanding are cancelled.
+        """
+        session = await self.session()
+        started = time.monotonic()
+        report: Dict[str, Dict] = {}
+
+        async def query(source: JobSource) -> Tuple[JobSource, List[Dict]]:
+            try:
+                postings = await asyncio.wait_for(source.fetch(session, job_title, location, limit), source.timeout)
+                report[source.name] = {"jobs": len(postings)}
+            except asyncio.TimeoutError:
+                postings = []
+                report[source.name] = {"jobs": 0, "error": f"timed out after {source.timeout}s"}
+            except Exception as e:
+                postings = []
+                report[source.name] = {"jobs": 0, "error": str(e) or type(e).__name__}
+                logger.warning("Job source %s failed: %s", source.name, e)
+            report[source.name]["elapsed_ms"] = round((time.monotonic() - started) * 1000, 1)
+            return source, postings
+
+        jobs: List[Dict] = []
+        seen_urls = set()
+        pending = [asyncio.ensure_future(query(source)) for source in self.sources]
+        try:
+            for next_done in asyncio.as_completed(pending):
+                _, postings = await next_done
+                # Only postings another source already returned are dropped; a source's own repeats stand
+                jobs.extend(posting for posting in postings if not posting['url'] or posting['url'] not in seen_urls)
+                seen_urls.update(posting['url'] for posting in postings)
+                if len(jobs) >= limit:
+                    break
+        finally:
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+            for source in self.sources:
+                report.setdefault(source.name, {"jobs": 0, "error": "cancelled, limit already reached"})
+        return jobs[:limit], report
+
+    async def close(self) -> None:
+        session, loop = self._session, self._session_loop
+        self._session = None
+        if session is None or session.closed:
+            return
+        if loop is not asyncio.get_running_loop() and loop.is_running():
+            # Made on a loop that is still serving another thread; its connections must be closed there
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+        else:
+            # Our own loop, or one that has stopped and took its connections with it
+            await session.close()
@@ -0,0 +1,103 @@
+# app/services/metrics_service.py
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, Iterator, List, Optional, Tuple
+from app.config import settings
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Histogram:
+    """Fixed-bucket latency histogram (cumulative on export, like Prometheus)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+class MetricsRegistry:
+    """Histograms keyed by metric name and a single label value"""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._histograms: Dict[str, Dict[str, Histogram]] = {}
+
+    def observe(self, name: str, label: str, seconds: float) -> None:
+        series = self._histograms.setdefault(name, {})
+        histogram = series.get(label)
+        if histogram is None:
+            histogram = series[label] = Histogram()
+        histogram.observe(seconds)
+
+    def timer(self, name: str, collect: bool = False) -> "StageTimer":
+        """A timer that feeds this registry; a no-op one when metrics are off and nobody wants the numbers"""
+        if not self.enabled and not collect:
+            return NULL_TIMER
+        return StageTimer(self if self.enabled else None, name)
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        for name, series in self._histograms.items():
+            lines.append(f"# TYPE {name} histogram")
+            for label, histogram in series.items():
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{stage="{label}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{name}_sum{{stage="{label}"}} {histogram.total}')
+                lines.append(f'{name}_count{{stage="{label}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+class StageTimer:
+    """Accumulates wall time per named stage and reports each stage to a histogram as it finishes"""
+    active = True
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, name: str = ""):
+        self.registry = registry
+        self.name = name
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+        if self.registry is not None:
+            self.registry.observe(self.name, stage, seconds)
+
+    def merge(self, timings: Dict[str, float]) -> None:
+        """Fold in timings measured elsewhere (e.g. inside a worker process)"""
+        for stage, seconds in timings.items():
+            self.add(stage, seconds)
+
+    def report(self) -> Dict[str, float]:
+        """Timings in milliseconds for API responses"""
+        return {stage: round(seconds * 1000, 3) for stage, seconds in self.timings.items()}
+
+class _NullTimer(StageTimer):
+    """Shared do-nothing timer so disabled instrumentation costs one attribute lookup"""
+    active = False
+
+    def stage(self, stage: str) -> ContextManager[None]:
+        return _NO_OP
+
+    def add(self, stage: str, seconds: float) -> None:
+        pass
+
+_NO_OP = nullcontext()
+NULL_TIMER = _NullTimer()
+
+metrics = MetricsRegistry(enabled=settings.METRICS_ENABLED)
@@ -0,0 +1,231 @@
+# app/services/resume_cache_service.py
+import gzip
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from app.config import settings
+from app.services.skill_taxonomy import get_taxonomy
+
+# Bump whenever the shape of a parse result changes so entries written by older code are not served
+PARSE_RESULT_SCHEMA = 4
+
+class ResumeParseCache:
+    """Content-addressed cache of parsed resumes with an in-memory LRU and an optional disk tier.
+
+    The disk tier is bounded by disk_max_bytes (compressed), pruning the
+    oldest-written entries first, including ones left by earlier runs.
+    """
+
+    def __init__(self, max_bytes: int, cache_dir: Optional[str] = None, disk_max_bytes: int = 1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir or None
+        self.disk_max_bytes = disk_max_bytes
+        # Disk entry paths and their sizes, oldest first
+        self._disk_files: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_size = 0
+        # Entries are kept as serialized JSON so size accounting is exact and
+        # callers always get a fresh copy they are free to mutate
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        # Text lookups are counted apart so the hit rate above stays the parse cache's
+        self.text_hits = 0
+        self.text_misses = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._scan_disk()
+
+    @staticmethod
+    def make_key(content_sha256: str, taxonomy_version: Optional[str] = None) -> str:
+        """Key on the SHA-256 of the uploaded bytes plus the skill taxonomy and result schema that produced the result.
+        
+        taxonomy_version defaults to the taxonomy loaded in this process. Results
+        are stored under the version they report, since the worker that made
+        them may not have reloaded yet.
+        """
+        return f"{content_sha256}-{taxonomy_version or get_taxonomy().version}-s{PARSE_RESULT_SCHEMA}"
+
+    @staticmethod
+    def make_text_key(content_sha256: str) -> str:
+        """Extracted text doesn't depend on the taxonomy, so it survives taxonomy reloads"""
+        return f"{content_sha256}-text-s{PARSE_RESULT_SCHEMA}"
+
+    def get_text(self, content_sha256: str) -> Optional[str]:
+        """Return the extracted text of a document by the SHA-256 of its bytes, or None on a miss"""
+        payload = self._load(self.make_text_key(content_sha256))
+        if payload is None:
+            self.text_misses += 1
+            return None
+        self.text_hits += 1
+        return json.loads(payload)["raw_text"]
+
+    def has_text(self, content_sha256: str) -> bool:
+        """Whether the text of a document is cached, without reading it"""
+        key = self.make_text_key(content_sha256)
+        return key in self._entries or bool(self.cache_dir and os.path.exists(self._disk_path(key)))
+
+    def set_text(self, content_sha256: str, text: str) -> None:
+        self.set(self.make_text_key(content_sha256), {"raw_text": text})
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached parse result for key, or None on a miss"""
+        payload, tier = self._lookup(key)
+        self._count(tier)
+        return json.loads(payload) if payload is not None else None
+
+    def get_with_text(self, key: str, content_sha256: str) -> Optional[Dict]:
+        """Cached parse result for key with the document's text as raw_text, or None on a miss.
+
+        A result whose text has been evicted counts as a miss: the document has to be parsed again.
+        """
+        payload, tier = self._lookup(key)
+        text = self._load(self.make_text_key(content_sha256)) if payload is not None else None
+        if text is None:
+            self._count(None)
+            return None
+        self._count(tier)
+        result = json.loads(payload)
+        result['raw_text'] = json.loads(text)['raw_text']
+        return result
+
+    def _count(self, tier: Optional[str]) -> None:
+        if tier == 'memory':
+            self.memory_hits += 1
+        elif tier == 'disk':
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+
+    def _lookup(self, key: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """Serialized entry for key and the tier ('memory' or 'disk') it came from, without counting it"""
+        payload = self._entries.get(key)
+        if payload is not None:
+            self._entries.move_to_end(key)
+            return payload, 'memory'
+        payload = self._read_disk(key)
+        if payload is not None:
+            self._remember(key, payload)
+            return payload, 'disk'
+        return None, None
+
+    def _load(self, key: str) -> Optional[bytes]:
+        """Serialized entry for key from either tier, without touching the parse hit/miss counters"""
+        return self._lookup(key)[0]
+
+    def set(self, key: str, value: Dict) -> None:
+        """Store a parse result in memory and, if configured, on disk"""
+        payload = json.dumps(value, separators=(',', ':')).encode('utf-8')
+        self._remember(key, payload)
+        self._write_disk(key, payload)
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (the disk tier is left untouched)"""
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current memory usage"""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0,
+            "text_hits": self.text_hits,
+            "text_misses": self.text_misses,
+            "entries": len(self._entries),
+            "memory_bytes": self._size,
+            "memory_budget_bytes": self.max_bytes,
+            "disk_enabled": bool(self.cache_dir),
+            "disk_entries": len(self._disk_files),
+            "disk_bytes": self._disk_size,
+            "disk_budget_bytes": self.disk_max_bytes,
+            "taxonomy_version": get_taxonomy().version
+        }
+
+    def _remember(self, key: str, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+
+        self._entries[key] = payload
+        self._size += len(payload)
+
+        # Evict least recently used entries until we are back under budget
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json.gz")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.cache_dir:
+            return None
+        try:
+            with gzip.open(self._disk_path(key), 'rb') as f:
+                return f.read()
+        except (OSError, EOFError):
+            return None
+
+    def _write_disk(self, key: str, payload: bytes) -> None:
+        if not self.cache_dir:
+            return
+        compressed = gzip.compress(payload)
+        if len(compressed) > self.disk_max_bytes:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file and rename so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self._disk_size += len(compressed) - self._disk_files.pop(path, 0)
+        self._disk_files[path] = len(compressed)
+        self._prune_disk()
+
+    def _scan_disk(self) -> None:
+        """Account for entries already on disk, oldest first, and prune them to the budget"""
+        found = []
+        for directory, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if not name.endswith('.json.gz'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(found):
+            self._disk_files[path] = size
+            self._disk_size += size
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        while self._disk_size > self.disk_max_bytes and self._disk_files:
+            path, size = self._disk_files.popitem(last=False)
+            self._disk_size -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+resume_cache = ResumeParseCache(
+    settings.RESUME_CACHE_MAX_BYTES,
+    settings.RESUME_CACHE_DIR,
+    disk_max_bytes=settings.RESUME_CACHE_DISK_MAX_BYTES
+)
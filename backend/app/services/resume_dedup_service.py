@@ -0,0 +1,117 @@
+# app/services/resume_dedup_service.py
+import re
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.config import settings
+
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16  # 8 rows per band: pairs above ~0.7 Jaccard almost always share a bucket
+SHINGLE_WORDS = 3
+
+# Fixed seed: signatures are computed in worker processes and must agree with each other
+_rng = np.random.default_rng(0x5EED)
+# Multiply-shift hashing, (a * x + b) mod 2**64 >> 32 with odd a: uint64 wraparound does the
+# modulo for free, which is several times faster than a prime modulus in numpy
+_PERM_A = (_rng.integers(0, 2 ** 63, size=NUM_PERMUTATIONS, dtype=np.uint64) * np.uint64(2) + np.uint64(1))[:, None]
+_PERM_B = _rng.integers(0, 2 ** 63, size=NUM_PERMUTATIONS, dtype=np.uint64)[:, None]
+# Mixing constants that combine consecutive word hashes into a shingle hash
+_SHINGLE_MIX = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 1], dtype=np.uint64)
+
+_WORD = re.compile(r'\w+')
+_BLOCK = 4096  # shingles hashed per numpy step, to bound the temporary matrix
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature over word 3-gram shingles of text, or None if the text has no words"""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return None
+
+    word_hashes = np.fromiter(
+        (zlib.crc32(word.encode('utf-8')) for word in words),
+        dtype=np.uint64,
+        count=len(words)
+    )
+    if len(words) < SHINGLE_WORDS:
+        shingles = word_hashes[:1] + word_hashes[1:].sum()
+    else:
+        # Repeated shingles hash alike and can't change a minimum, so no dedup is needed
+        span = len(words) - SHINGLE_WORDS + 1
+        shingles = sum(word_hashes[i:i + span] * _SHINGLE_MIX[i] for i in range(SHINGLE_WORDS))
+
+    signature = np.full(NUM_PERMUTATIONS, np.iinfo(np.uint64).max, dtype=np.uint64)
+    for start in range(0, len(shingles), _BLOCK):
+        block = shingles[start:start + _BLOCK]
+        np.minimum(signature, ((_PERM_A * block + _PERM_B) >> np.uint64(32)).min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+def estimate_similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the documents behind two signatures"""
+    return float(np.count_nonzero(first == second)) / NUM_PERMUTATIONS
+
+class MinHashLSHIndex:
+    """Banded LSH over MinHash signatures, for finding near-duplicate documents without a full scan"""
+
+    def __init__(self, threshold: float, max_documents: int, bands: int = LSH_BANDS):
+        self.threshold = threshold
+        self.max_documents = max_documents
+        self.bands = bands
+        self.rows = NUM_PERMUTATIONS // bands
+        self._signatures: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(bands)]
+        self.queries = 0
+        self.duplicates = 0
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        rows = self.rows
+        return [signature[band * rows:(band + 1) * rows].tobytes() for band in range(self.bands)]
+
+    def query(self, signature: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Return the indexed document most similar to signature, if any reaches the threshold"""
+        self.queries += 1
+        candidates = set()
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(key, ()))
+
+        best = None
+        for doc_id in candidates:
+            similarity = estimate_similarity(signature, self._signatures[doc_id])
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (doc_id, similarity)
+        if best is not None:
+            self.duplicates += 1
+        return best
+
+    def add(self, doc_id: str, signature: np.ndarray) -> None:
+        if doc_id in self._signatures:
+            self._signatures.move_to_end(doc_id)
+            return
+
+        self._signatures[doc_id] = signature
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(key, []).append(doc_id)
+
+        while len(self._signatures) > self.max_documents:
+            self._remove(*self._signatures.popitem(last=False))
+
+    def _remove(self, doc_id: str, signature: np.ndarray) -> None:
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets[key]
+            bucket.remove(doc_id)
+            if not bucket:
+                del buckets[key]
+
+    def stats(self) -> Dict:
+        return {
+            "documents": len(self._signatures),
+            "max_documents": self.max_documents,
+            "threshold": self.threshold,
+            "queries": self.queries,
+            "duplicates": self.duplicates
+        }
+
+resume_dedup_index = MinHashLSHIndex(
+    threshold=settings.RESUME_DEDUP_THRESHOLD,
+    max_documents=settings.RESUME_DEDUP_MAX_DOCUMENTS
+)
@@ -0,0 +1,177 @@
+# app/services/resume_job_service.py
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from app.config import settings
+from app.services.resume_parser_service import RESUME_STAGES, ResumeParserService
+from app.services.upload_service import SpooledUpload
+
+class QueueFullError(RuntimeError):
+    pass
+
+class ResumeJob:
+    """State of one queued resume parse, plus the progress events emitted so far"""
+
+    def __init__(self, filename: str):
+        self.job_id = uuid.uuid4().hex
+        self.filename = filename
+        self.status = "queued"
+        self.stage: Optional[str] = None
+        self.progress = 0.0
+        self.created_at = datetime.utcnow().isoformat()
+        self.updated_at = self.created_at
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.events: List[Dict] = []
+        # Set and replaced on every new event, so waiters wake exactly once per change
+        self.changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        data = {
+            "job_id": self.job_id,
+            "filename": self.filename,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+        if self.error:
+            data["error"] = self.error
+        if include_result and self.result is not None:
+            data["result"] = self.result
+        return data
+
+class ResumeJobQueue:
+    """Bounded in-process queue of resume parses worked by a fixed number of asyncio workers"""
+
+    def __init__(self, workers: int, max_queued: int, retention: int):
+        self.worker_count = max(1, workers)
+        self.max_queued = max_queued
+        self.retention = retention
+        self.jobs: "OrderedDict[str, ResumeJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def _ensure_started(self) -> asyncio.Queue:
+        # Created lazily so the queue and workers bind to the server's running loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queued)
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+        return self._queue
+
+    async def stop(self) -> None:
+        """Cancel the workers (called on application shutdown)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def submit(self, upload: SpooledUpload, filename: str) -> ResumeJob:
+        """Queue a spooled upload for parsing; raises QueueFullError when the queue is at capacity"""
+        queue = self._ensure_started()
+        job = ResumeJob(filename)
+        try:
+            queue.put_nowait((job, upload))
+        except asyncio.QueueFull:
+            raise QueueFullError("Resume processing queue is full, try again shortly")
+
+        self.jobs[job.job_id] = job
+        self._evict_finished()
+        self._record(job, "queued")
+        return job
+
+    def get(self, job_id: str) -> Optional[ResumeJob]:
+        return self.jobs.get(job_id)
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.worker_count,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queued": self.max_queued,
+            "tracked_jobs": len(self.jobs)
+        }
+
+    async def events(self, job: ResumeJob, heartbeat_seconds: float = 15.0) -> AsyncIterator[Optional[Dict]]:
+        """Replay a job's events, then follow new ones until it finishes.
+
+        Yields None when nothing has happened for heartbeat_seconds so callers
+        can keep an idle connection alive.
+        """
+        seen = 0
+        while True:
+            if seen == len(job.events):
+                if job.finished:
+                    return
+                try:
+                    await asyncio.wait_for(job.changed.wait(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield None
+                continue
+
+            pending = job.events[seen:]
+            seen = len(job.events)
+            for event in pending:
+                yield event
+
+    async def _worker(self) -> None:
+        while True:
+            job, upload = await self._queue.get()
+            try:
+                await self._process(job, upload)
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"Failed to parse resume: {str(e)}"
+                self._record(job, job.status)
+            finally:
+                upload.cleanup()
+                self._queue.task_done()
+
+    async def _process(self, job: ResumeJob, upload: SpooledUpload) -> None:
+        def on_stage(stage: str) -> None:
+            job.stage = stage
+            job.progress = round(RESUME_STAGES.index(stage) / len(RESUME_STAGES), 2)
+            self._record(job, "stage")
+
+        job.status = "running"
+        self._record(job, "running")
+
+        result = await ResumeParserService.parse_upload(upload, job.filename, on_stage=on_stage)
+
+        job.stage = None
+        if "error" in result:
+            job.status = "failed"
+            job.error = result["error"]
+        else:
+            job.status = "completed"
+            job.progress = 1.0
+            # Kept for up to RESUME_JOB_RETENTION jobs, so without the text; that's served from /resume/text/{hash}
+            job.result = {key: value for key, value in result.items() if key != 'raw_text'}
+        self._record(job, job.status)
+
+    def _record(self, job: ResumeJob, event: str) -> None:
+        job.updated_at = datetime.utcnow().isoformat()
+        job.events.append({"event": event, **job.to_dict(include_result=False)})
+        changed, job.changed = job.changed, asyncio.Event()
+        changed.set()
+
+    def _evict_finished(self) -> None:
+        # Forget the oldest finished jobs once we track more than the retention limit
+        excess = len(self.jobs) - self.retention
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished][:excess]:
+            del self.jobs[job_id]
+
+resume_jobs = ResumeJobQueue(
+    workers=settings.RESUME_JOB_WORKERS,
+    max_queued=settings.RESUME_JOB_QUEUE_SIZE,
+    retention=settings.RESUME_JOB_RETENTION
+)
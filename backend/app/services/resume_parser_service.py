@@ -1,227 +1,585 @@
 # app/services/resume_parser_service.py
 import re
-import io
-from typing import Dict, List, Optional
+import time
+import asyncio
+import zipfile
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Callable, Dict, List, Optional, Tuple
 from fastapi import UploadFile
 import PyPDF2
 from docx import Document
+import numpy as np
+from lxml import etree
+from app.config import settings
+from app.services.experience_timeline import extract_timeline
+from app.services.metrics_service import NULL_TIMER, StageTimer, metrics
+from app.services.resume_cache_service import resume_cache
+from app.services.resume_dedup_service import minhash_signature, resume_dedup_index
+from app.services.resume_scanner import scan_resume
+from app.services.resume_search_service import resume_index
+from app.services.skill_taxonomy import encode_vector, get_taxonomy
+from app.services.text_normalizer import NormalizedText, normalize_text
+from app.services.upload_service import SpooledUpload, UnsupportedFormatError, UploadTooLargeError, decode_text
+
+# Archive members worth opening; uploads themselves are accepted by sniffed content, not name
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+# Parse stages in order; text extraction first, then analysis of the extracted text
+ANALYSIS_STAGES = ('scan', 'skills', 'timeline')
+RESUME_STAGES = ('extract',) + ANALYSIS_STAGES
+
+# Histogram the per-stage timings are recorded under (labelled by stage)
+RESUME_STAGE_METRIC = 'resume_parse_stage_seconds'
+
+# Share of RESUME_PARSE_TIMEOUT_SECONDS PDF page extraction may use, leaving the rest for analysis
+PDF_EXTRACT_TIME_SHARE = 0.5
+
+# WordprocessingML tags the streaming DOCX extractor cares about
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_T = W_NS + 't'
+W_TAB = W_NS + 'tab'
+W_P = W_NS + 'p'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+DOCX_TEXT_TAGS = [W_T, W_TAB, W_NS + 'br', W_NS + 'cr', W_P, MC_FALLBACK]
+DOCX_HEADER_PART = re.compile(r'word/header\d*\.xml$')
+DOCX_FOOTER_PART = re.compile(r'word/footer\d*\.xml$')
+
+class ParseTimeoutError(Exception):
+    """A worker call ran past RESUME_PARSE_TIMEOUT_SECONDS"""
+
+    def __init__(self, seconds: float):
+        super().__init__(f"Resume took longer than {seconds}s to parse")
 
 class ResumeParserService:
+    # CPU-bound extraction runs in worker processes so the event loop stays responsive
+    _executor: Optional[ProcessPoolExecutor] = None
+    _parse_slots = asyncio.Semaphore(settings.RESUME_MAX_CONCURRENT_PARSES)
+    # One call per worker at a time, so a call's timeout only counts time spent running
+    _worker_slots = asyncio.Semaphore(max(1, settings.RESUME_PARSE_WORKERS))
+    
+    @staticmethod
+    def get_executor() -> ProcessPoolExecutor:
+        """Lazily create the shared parsing process pool"""
+        if ResumeParserService._executor is None:
+            ResumeParserService._executor = ProcessPoolExecutor(
+                max_workers=max(1, settings.RESUME_PARSE_WORKERS)
+            )
+        return ResumeParserService._executor
+    
+    @staticmethod
+    def shutdown_executor() -> None:
+        """Stop the parsing process pool (called on application shutdown)"""
+        if ResumeParserService._executor is not None:
+            ResumeParserService._executor.shutdown(wait=False, cancel_futures=True)
+            ResumeParserService._executor = None
+    
+    @staticmethod
+    def _recycle_executor() -> None:
+        """Kill the pool's worker processes, e.g. one stuck on a hostile document; new calls get a fresh pool"""
+        executor = ResumeParserService._executor
+        if executor is None:
+            return
+        ResumeParserService._executor = None
+        # ProcessPoolExecutor can't cancel a running call; calls in flight on the other workers fail too
+        for process in list(executor._processes.values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    async def parse_resume(file: UploadFile, timer: Optional[StageTimer] = None) -> Dict:
+        """Parse uploaded resume file and extract text
+        
+        Stage timings go to the metrics registry, and into timer when the
+        caller passes one to read them back.
+        """
+        if timer is None:
+            timer = metrics.timer(RESUME_STAGE_METRIC)
+        
+        with timer.stage('total'):
+            try:
+                with timer.stage('read'):
+                    upload = await ResumeParserService.spool(file)
+            except UploadTooLargeError as e:
+                return {"error": str(e), "status_code": 413}
+            except UnsupportedFormatError as e:
+                return {"error": str(e), "status_code": 415}
+            except Exception as e:
+                return {"error": f"Failed to parse resume: {str(e)}"}
+            
+            try:
+                return await ResumeParserService.parse_upload(upload, file.filename, timer=timer)
+            finally:
+                upload.cleanup()
+    
+    @staticmethod
+    async def spool(file: UploadFile) -> SpooledUpload:
+        """Copy an upload into a SpooledUpload under the configured size limits"""
+        return await SpooledUpload.from_upload(
+            file,
+            max_bytes=settings.RESUME_MAX_UPLOAD_BYTES,
+            spool_threshold=settings.RESUME_SPOOL_THRESHOLD_BYTES
+        )
+    
+    @staticmethod
+    def spool_stream(stream: BinaryIO) -> SpooledUpload:
+        """Blocking spool() for a file object such as a batch part or zip member"""
+        return SpooledUpload.from_stream(
+            stream,
+            max_bytes=settings.RESUME_MAX_UPLOAD_BYTES,
+            spool_threshold=settings.RESUME_SPOOL_THRESHOLD_BYTES
+        )
     
     @staticmethod
-    async def parse_resume(file: UploadFile) -> Dict:
-        """Parse uploaded resume file and extract text"""
+    async def parse_upload(
+        upload: SpooledUpload,
+        filename: str,
+        on_stage: Optional[Callable[[str], None]] = None,
+        timer: Optional[StageTimer] = None
+    ) -> Dict:
+        """Parse a spooled upload, serving repeat documents from the parse cache.
+        
+        With on_stage, each stage in RESUME_STAGES runs as its own worker call and
+        on_stage is called as it starts, so callers can report progress. Without
+        it the whole document is parsed in a single worker round trip, which
+        times its own stages and sends the timings back with the result.
+        
+        The extracted text is cached apart from the analysis, under the
+        document's content hash, so it can also be served on its own. With
+        RESUME_DEDUP_ENABLED, near-duplicates of earlier resumes are flagged.
+        """
+        if timer is None:
+            timer = metrics.timer(RESUME_STAGE_METRIC)
+        if upload.kind is None:
+            return {"error": str(UnsupportedFormatError()), "status_code": 415}
+        
         try:
-            content = await file.read()
+            # Re-uploads of the same bytes skip extraction entirely
+            with timer.stage('cache_lookup'):
+                cache_key = resume_cache.make_key(upload.sha256)
+                cached = resume_cache.get_with_text(cache_key, upload.sha256)
+            if cached is not None:
+                cached['content_hash'] = upload.sha256
+                cached['filename'] = filename
+                ResumeParserService._index(cached)
+                return cached
             
-            if file.filename.endswith('.pdf'):
-                text = ResumeParserService._parse_pdf(content)
-            elif file.filename.endswith('.docx'):
-                text = ResumeParserService._parse_docx(content)
-            elif file.filename.endswith('.txt'):
-                text = content.decode('utf-8')
-            else:
-                raise ValueError("Unsupported file format. Use PDF, DOCX, or TXT")
+            # Bound how many documents are queued for extraction at once
+            with timer.stage('queue_wait'):
+                await ResumeParserService._parse_slots.acquire()
+            try:
+                if on_stage is None:
+                    parsed_data, signature, worker_timings = await ResumeParserService._run_in_worker(
+                        ResumeParserService._parse_document, upload, settings.RESUME_DEDUP_ENABLED, timer.active
+                    )
+                    timer.merge(worker_timings)
+                else:
+                    parsed_data, signature = await ResumeParserService._parse_in_stages(upload, on_stage, timer)
+            except ParseTimeoutError as e:
+                return {"error": str(e), "status_code": 422}
+            finally:
+                ResumeParserService._parse_slots.release()
             
-            # Extract structured data
-            parsed_data = ResumeParserService._extract_resume_data(text)
-            parsed_data['raw_text'] = text
-            parsed_data['filename'] = file.filename
+            if signature is not None:
+                with timer.stage('dedup'):
+                    ResumeParserService._flag_near_duplicate(upload.sha256, signature, parsed_data)
             
+            with timer.stage('cache_store'):
+                # Keyed on the version the worker actually extracted skills with, not ours
+                cache_key = resume_cache.make_key(upload.sha256, parsed_data.get('taxonomy_version'))
+                resume_cache.set(cache_key, {key: value for key, value in parsed_data.items() if key != 'raw_text'})
+                resume_cache.set_text(upload.sha256, parsed_data['raw_text'])
+            parsed_data['content_hash'] = upload.sha256
+            parsed_data['filename'] = filename
+            ResumeParserService._index(parsed_data)
             return parsed_data
             
         except Exception as e:
             return {"error": f"Failed to parse resume: {str(e)}"}
     
     @staticmethod
-    def _parse_pdf(content: bytes) -> str:
-        """Extract text from PDF"""
-        text = ""
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+    def _index(parsed_data: Dict) -> None:
+        """Make a parsed resume searchable from /resume/search"""
+        if settings.RESUME_INDEX_ENABLED:
+            resume_index.add(parsed_data)
     
     @staticmethod
-    def _parse_docx(content: bytes) -> str:
-        """Extract text from DOCX"""
-        doc = Document(io.BytesIO(content))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+    def _flag_near_duplicate(content_hash: str, signature: np.ndarray, parsed_data: Dict) -> None:
+        """Note the most similar earlier resume, if any, then index this one"""
+        duplicate = resume_dedup_index.query(signature)
+        # Our own bytes match if they were parsed before but have since been evicted from the cache
+        if duplicate is not None and duplicate[0] != content_hash:
+            parsed_data['near_duplicate_of'] = duplicate[0]
+            parsed_data['duplicate_similarity'] = round(duplicate[1], 3)
+        resume_dedup_index.add(content_hash, signature)
+    
+    @staticmethod
+    async def _parse_in_stages(
+        upload: SpooledUpload,
+        on_stage: Callable[[str], None],
+        timer: StageTimer
+    ) -> Tuple[Dict, Optional[np.ndarray]]:
+        """Extract text in one worker call, then run each analysis stage as a further call"""
+        on_stage('extract')
+        document, truncated, signature, worker_timings = await ResumeParserService._run_in_worker(
+            ResumeParserService._extract_document, upload, settings.RESUME_DEDUP_ENABLED, timer.active
+        )
+        timer.merge(worker_timings)
+        
+        analysis = {}
+        context = {}
+        for stage in ANALYSIS_STAGES:
+            on_stage(stage)
+            with timer.stage(stage):
+                stage_data, context = await ResumeParserService._run_in_worker(
+                    ResumeParserService._analyze_stage_with_context, stage, document, context
+                )
+                analysis.update(stage_data)
+        analysis['text_length'] = len(document.original)
+        return ResumeParserService._finish_parse(document.original, truncated, analysis), signature
+    
+    @staticmethod
+    async def _run_in_worker(func: Callable, *args):
+        """Run func in the parsing pool, raising ParseTimeoutError if it runs past RESUME_PARSE_TIMEOUT_SECONDS"""
+        loop = asyncio.get_running_loop()
+        try:
+            async with ResumeParserService._worker_slots:
+                future = loop.run_in_executor(ResumeParserService.get_executor(), func, *args)
+                # Not wait_for: it can swallow a cancellation that lands as the parse finishes,
+                # leaving the cancelled caller (e.g. a job-queue worker at shutdown) running
+                try:
+                    done, _ = await asyncio.wait({future}, timeout=settings.RESUME_PARSE_TIMEOUT_SECONDS)
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                if not done:
+                    future.cancel()
+                    ResumeParserService._recycle_executor()
+                    raise ParseTimeoutError(settings.RESUME_PARSE_TIMEOUT_SECONDS)
+                return future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a hostile PDF); start a fresh pool next time
+            ResumeParserService.shutdown_executor()
+            raise
     
     @staticmethod
-    def _extract_resume_data(text: str) -> Dict:
-        """Extract structured data from resume text"""
+    async def iter_batch_documents(
+        files: List[UploadFile],
+        archives: ExitStack
+    ) -> AsyncIterator[Tuple[str, Optional[Callable[[], SpooledUpload]]]]:
+        """Yield (filename, loader) pairs for every resume in a batch, expanding zip archives lazily.
         
-        # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
+        Loaders spool their document under the upload size limit when the parse
+        starts, so a batch part is never read into memory whole. Zip archives
+        are opened off the event loop and registered with archives; the caller
+        closes it once every loader has run.
+        """
+        for upload in files:
+            filename = upload.filename or ""
+            if not filename.lower().endswith('.zip'):
+                yield filename, (lambda f=upload.file: (f.seek(0), ResumeParserService.spool_stream(f))[1])
+                continue
+            
+            archive = archives.enter_context(await asyncio.to_thread(zipfile.ZipFile, upload.file))
+            for member in archive.infolist():
+                name = member.filename
+                if member.is_dir() or name.startswith('__MACOSX/') or not name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    continue
+                if member.file_size > settings.RESUME_MAX_UPLOAD_BYTES:
+                    # Checked against the declared size so a zip bomb is never inflated
+                    yield name, None
+                    continue
+                yield name, (lambda a=archive, m=member: ResumeParserService._spool_member(a, m))
+    
+    @staticmethod
+    def _spool_member(archive: zipfile.ZipFile, member: zipfile.ZipInfo) -> SpooledUpload:
+        # Decompressed in chunks, so a member that lies about its size still stops at the limit
+        with archive.open(member) as stream:
+            return ResumeParserService.spool_stream(stream)
+    
+    @staticmethod
+    async def _load(load: Callable[[], SpooledUpload]) -> SpooledUpload:
+        """Run a batch loader in a thread, so reading and inflating a part doesn't block the event loop"""
+        loading = asyncio.ensure_future(asyncio.to_thread(load))
+        try:
+            return await asyncio.shield(loading)
+        except asyncio.CancelledError:
+            # The thread can't be stopped; clean up whatever it spools once it's done
+            loading.add_done_callback(ResumeParserService._discard_loaded)
+            raise
+    
+    @staticmethod
+    def _discard_loaded(loading: asyncio.Future) -> None:
+        if not loading.cancelled() and loading.exception() is None:
+            loading.result().cleanup()
+    
+    @staticmethod
+    async def parse_batch(documents: AsyncIterable[Tuple[str, Optional[Callable[[], SpooledUpload]]]]) -> AsyncIterator[Dict]:
+        """Parse many resumes concurrently, yielding each result as soon as it finishes"""
         
-        # Extract phone numbers
-        phone_pattern = r'(\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})'
-        phones = re.findall(phone_pattern, text)
+        async def parse_one(index: int, filename: str, load: Optional[Callable[[], SpooledUpload]]) -> Dict:
+            if load is None:
+                result = {"error": "File too large", "status_code": 413}
+            else:
+                upload = None
+                try:
+                    upload = await ResumeParserService._load(load)
+                    result = await ResumeParserService.parse_upload(upload, filename)
+                except (UploadTooLargeError, UnsupportedFormatError) as e:
+                    result = {"error": str(e)}
+                except Exception as e:
+                    result = {"error": f"Failed to parse resume: {str(e)}"}
+                finally:
+                    if upload is not None:
+                        upload.cleanup()
+            
+            if "error" in result:
+                return {"index": index, "filename": filename, "status": "error", "error": result["error"]}
+            return {"index": index, "filename": filename, "status": "ok", "data": result}
+        
+        # Only a window of documents is in flight, so memory stays flat however large the batch
+        pending = set()
+        index = 0
+        try:
+            async for filename, load in documents:
+                if index >= settings.RESUME_BATCH_MAX_FILES:
+                    yield {"index": index, "filename": filename, "status": "error",
+                           "error": f"Batch limit of {settings.RESUME_BATCH_MAX_FILES} files reached"}
+                    break
+                
+                if len(pending) >= settings.RESUME_BATCH_CONCURRENCY:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+                
+                pending.add(asyncio.create_task(parse_one(index, filename, load)))
+                index += 1
+            
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # Client went away mid-stream; don't keep parsing for nobody
+            for task in pending:
+                task.cancel()
+    
+    @staticmethod
+    def _parse_document(
+        upload: SpooledUpload,
+        with_signature: bool,
+        timed: bool = False
+    ) -> Tuple[Dict, Optional[np.ndarray], Dict[str, float]]:
+        """Extract text and structured data from a document (runs in a worker process).
+        
+        Returns the parsed data, the text's MinHash signature if asked for, and,
+        when timed, seconds spent in each stage.
+        """
+        timer = StageTimer() if timed else NULL_TIMER
+        document, truncated, signature, timings = ResumeParserService._extract_document(upload, with_signature, timed)
+        timer.merge(timings)
+        
+        # Extract structured data
+        parsed_data = ResumeParserService._extract_resume_data(document, timer)
+        return ResumeParserService._finish_parse(document.original, truncated, parsed_data), signature, timer.timings
+    
+    @staticmethod
+    def _extract_document(
+        upload: SpooledUpload,
+        with_signature: bool,
+        timed: bool = False
+    ) -> Tuple[NormalizedText, Optional[str], Optional[np.ndarray], Dict[str, float]]:
+        """Extract and normalize text and, if asked, compute its MinHash signature (runs in a worker process)"""
+        timer = StageTimer() if timed else NULL_TIMER
+        with timer.stage('extract'):
+            text, truncated = ResumeParserService._extract_text(upload)
+        with timer.stage('normalize'):
+            document = normalize_text(text)
+        signature = None
+        if with_signature:
+            with timer.stage('minhash'):
+                signature = minhash_signature(document.text)
+        return document, truncated, signature, timer.timings
+    
+    @staticmethod
+    def _extract_text(upload: SpooledUpload) -> Tuple[str, Optional[str]]:
+        """Extract raw text, plus a truncation reason if a limit cut extraction short.
+        
+        The extractor is chosen by the upload's sniffed format, not its filename.
+        """
+        truncated = None
+        with upload.open() as stream:
+            if upload.kind == 'pdf':
+                text, truncated = ResumeParserService._parse_pdf(stream)
+            elif upload.kind == 'docx':
+                text = ResumeParserService._parse_docx(stream)
+            elif upload.kind == 'txt':
+                text = decode_text(stream.read())
+            else:
+                raise ValueError("Unsupported file format. Use PDF, DOCX, or TXT")
+        return text, truncated
+    
+    @staticmethod
+    def _finish_parse(text: str, truncated: Optional[str], parsed_data: Dict) -> Dict:
+        parsed_data['raw_text'] = text
+        parsed_data['truncated'] = truncated is not None
+        if truncated:
+            parsed_data['truncation_reason'] = truncated
+        return parsed_data
+    
+    @staticmethod
+    def _parse_pdf(stream: BinaryIO) -> Tuple[str, Optional[str]]:
+        """Extract text from PDF page by page, stopping early at the page, size or time limit.
+        
+        Returns the text and, if extraction stopped early, the reason why.
+        """
+        time_limit = settings.RESUME_PARSE_TIMEOUT_SECONDS * PDF_EXTRACT_TIME_SHARE
+        deadline = time.monotonic() + time_limit
+        pdf_reader = PyPDF2.PdfReader(stream)
+        chunks = []
+        text_bytes = 0
+        truncated = None
+        
+        # Pages are loaded lazily from the stream, so we never materialise more than we keep
+        for page_number, page in enumerate(pdf_reader.pages):
+            if page_number >= settings.RESUME_PDF_MAX_PAGES:
+                truncated = f"page limit of {settings.RESUME_PDF_MAX_PAGES} reached"
+                break
+            if time.monotonic() > deadline:
+                truncated = f"time limit of {time_limit}s reached"
+                break
+            
+            page_text = page.extract_text() or ""
+            text_bytes += len(page_text.encode('utf-8'))
+            if text_bytes > settings.RESUME_MAX_TEXT_BYTES:
+                truncated = f"text limit of {settings.RESUME_MAX_TEXT_BYTES} bytes reached"
+                break
+            chunks.append(page_text)
+        
+        return "\n".join(chunks) + "\n", truncated
+    
+    @staticmethod
+    def _parse_docx(stream: BinaryIO) -> str:
+        """Extract text from DOCX, falling back to python-docx if the fast path can't read it"""
+        try:
+            return ResumeParserService._parse_docx_xml(stream)
+        except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError):
+            stream.seek(0)
+            doc = Document(stream)
+            return "\n".join(paragraph.text for paragraph in doc.paragraphs) + "\n"
+    
+    @staticmethod
+    def _parse_docx_xml(stream: BinaryIO) -> str:
+        """Stream w:t runs straight out of the DOCX parts without building the python-docx object model.
+        
+        Unlike python-docx's paragraph list this also picks up tables, text boxes,
+        headers and footers, which is where a lot of resumes keep their skills.
+        """
+        chunks: List[str] = []
+        with zipfile.ZipFile(stream) as archive:
+            names = archive.namelist()
+            headers = sorted(name for name in names if DOCX_HEADER_PART.match(name))
+            footers = sorted(name for name in names if DOCX_FOOTER_PART.match(name))
+            
+            for part in headers + ['word/document.xml'] + footers:
+                with archive.open(part) as xml:
+                    ResumeParserService._collect_docx_text(xml, chunks)
+        
+        return "".join(chunks)
+    
+    @staticmethod
+    def _collect_docx_text(xml: BinaryIO, chunks: List[str]) -> None:
+        """Append the text of one WordprocessingML part to chunks"""
+        fallback_depth = 0
+        for event, element in etree.iterparse(
+            xml,
+            events=('start', 'end'),
+            tag=DOCX_TEXT_TAGS,
+            resolve_entities=False,
+            no_network=True
+        ):
+            tag = element.tag
+            if tag == MC_FALLBACK:
+                # Text boxes are stored twice (DrawingML + a VML fallback); only read the first copy
+                fallback_depth += 1 if event == 'start' else -1
+                continue
+            if event == 'start' or fallback_depth:
+                continue
+            
+            if tag == W_T:
+                if element.text:
+                    chunks.append(element.text)
+            elif tag == W_TAB:
+                chunks.append("\t")
+            elif tag == W_P:
+                chunks.append("\n")
+                # Drop finished paragraphs so memory stays flat on long documents
+                element.clear()
+                parent = element.getparent()
+                if parent is not None:
+                    while element.getprevious() is not None:
+                        del parent[0]
+            else:
+                chunks.append("\n")
+    
+    @staticmethod
+    def _extract_resume_data(
+        document: NormalizedText,
+        timer: StageTimer = NULL_TIMER,
+        stages: Tuple[str, ...] = ANALYSIS_STAGES
+    ) -> Dict:
+        """Extract structured data from normalized resume text"""
+        parsed_data = {}
+        context = {}
+        for stage in stages:
+            with timer.stage(stage):
+                parsed_data.update(ResumeParserService._analyze_stage(stage, document, context))
+        parsed_data['text_length'] = len(document.original)
+        return parsed_data
+    
+    @staticmethod
+    def _analyze_stage_with_context(stage: str, document: NormalizedText, context: Dict) -> Tuple[Dict, Dict]:
+        """_analyze_stage for a worker call of its own, sending the updated context back too"""
+        return ResumeParserService._analyze_stage(stage, document, context), context
+    
+    @staticmethod
+    def _analyze_stage(stage: str, document: NormalizedText, context: Dict) -> Dict:
+        """Run one analysis stage over a normalized resume and return its slice of the result.
         
-        # Extract common skills (CS/CSE focused)
-        skills = ResumeParserService._extract_skills(text)
+        context carries what a stage leaves for later ones (the scan's sections), outside the result.
+        """
+        if stage == 'scan':
+            # Contacts, section boundaries and education/experience keywords in one pass
+            scan = scan_resume(document)
+            context['sections'] = scan.section_bounds
+            return {
+                "contact": {"emails": scan.emails, "phones": scan.phones},
+                "sections": scan.sections,
+                "education": scan.education,
+                "experience": {"levels": scan.levels, "roles": scan.roles}
+            }
         
-        # Extract education
-        education = ResumeParserService._extract_education(text)
+        if stage == 'skills':
+            # Extract common skills (CS/CSE focused)
+            taxonomy = get_taxonomy()
+            skills = ResumeParserService._extract_skills(document.text)
+            return {
+                "skills": skills,
+                # Compact bitmap of every skill found, indexed by taxonomy skill id
+                "skill_vector": encode_vector(taxonomy.to_vector(
+                    skill for category_skills in skills.values() for skill in category_skills
+                )),
+                "taxonomy_version": taxonomy.version
+            }
         
-        # Extract work experience keywords
-        experience = ResumeParserService._extract_experience(text)
+        if stage == 'timeline':
+            # Employment date ranges, total years and per-skill years/recency
+            return {"experience_timeline": extract_timeline(document, context['sections'])}
         
-        return {
-            "contact": {
-                "emails": emails,
-                "phones": phones
-            },
-            "skills": skills,
-            "education": education,
-            "experience": experience,
-            "text_length": len(text)
-        }
+        raise ValueError(f"Unknown analysis stage: {stage}")
     
     @staticmethod
     def _extract_skills(text: str) -> Dict[str, List[str]]:
         """Extract technical skills from resume"""
-        text_lower = text.lower()
-        
-        # Programming Languages (Updated)
-        programming_languages = [
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'c', 'go', 
-            'rust', 'swift', 'kotlin', 'scala', 'ruby', 'php', 'sql', 'html', 
-            'css', 'r', 'matlab', 'assembly', 'verilog', 'vhdl', 'systemverilog',
-            'perl', 'bash', 'powershell', 'dart', 'lua'
-        ]
-        
-        # Frameworks & Libraries (Updated with current market trends)
-        frameworks = [
-            'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask',
-            'spring', 'tensorflow', 'pytorch', 'keras', 'pandas', 'numpy',
-            'fastapi', 'next.js', 'svelte', 'bootstrap', 'tailwind', 'scikit-learn',
-            'opencv', 'hugging face', 'langchain', 'streamlit', 'gradio',
-            'react native', 'flutter', 'electron', 'ionic', 'xamarin'
-        ]
-        
-        # Databases (Updated)
-        databases = [
-            'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle',
-            'cassandra', 'dynamodb', 'elasticsearch', 'neo4j', 'influxdb',
-            'firebase', 'supabase', 'planetscale', 'cockroachdb'
-        ]
-        
-        # Cloud & DevOps (Updated)
-        cloud_devops = [
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins',
-            'terraform', 'ansible', 'linux', 'git', 'github', 'gitlab',
-            'ci/cd', 'devops', 'microservices', 'serverless', 'lambda',
-            'vercel', 'netlify', 'heroku', 'digitalocean', 'cloudflare'
-        ]
-        
-        # Hardware Engineering & EDA Tools (NEW CATEGORY)
-        hardware_engineering = [
-            'verilog', 'vhdl', 'systemverilog', 'vivado', 'quartus', 'modelsim',
-            'cadence', 'synopsys', 'mentor graphics', 'altium designer', 'kicad',
-            'fpga', 'asic', 'pcb design', 'schematic design', 'layout design',
-            'xilinx', 'altera', 'intel fpga', 'amd', 'arm', 'risc-v',
-            'embedded systems', 'microcontrollers', 'arduino', 'raspberry pi',
-            'jtag', 'spi', 'i2c', 'uart', 'pcie', 'ddr', 'usb'
-        ]
-        
-        # AI & Machine Learning (NEW CATEGORY)
-        ai_ml = [
-            'machine learning', 'deep learning', 'neural networks', 'nlp',
-            'computer vision', 'reinforcement learning', 'llm', 'gpt',
-            'chatgpt', 'openai', 'anthropic', 'claude', 'transformers',
-            'bert', 'stable diffusion', 'generative ai', 'prompt engineering'
-        ]
-        
-        # Development Tools (Updated)
-        development_tools = [
-            'visual studio code', 'intellij', 'eclipse', 'vim', 'emacs',
-            'jupyter', 'postman', 'insomnia', 'figma', 'adobe', 'slack', 'jira',
-            'confluence', 'notion', 'trello', 'asana', 'discord', 'teams'
-        ]
-        
-        # Web Technologies (NEW CATEGORY)
-        web_technologies = [
-            'rest api', 'graphql', 'websockets', 'json', 'xml', 'oauth',
-            'jwt', 'cors', 'https', 'cdn', 'progressive web app', 'pwa',
-            'responsive design', 'accessibility', 'seo', 'performance optimization'
-        ]
-        
-        # Soft Skills (NEW CATEGORY)
-        soft_skills = [
-            'leadership', 'teamwork', 'communication', 'problem solving',
-            'agile', 'scrum', 'kanban', 'project management', 'mentoring',
-            'collaboration', 'critical thinking', 'analytical', 'creative'
-        ]
-        
-        # Certifications (NEW CATEGORY)
-        certifications = [
-            'aws certified', 'google cloud certified', 'azure certified',
-            'comptia', 'cisco', 'pmp', 'scrum master', 'product owner',
-            'security+', 'network+', 'cissp', 'ceh', 'oscp'
-        ]
-        
-        # Emerging Technologies (NEW CATEGORY)
-        emerging_tech = [
-            'blockchain', 'cryptocurrency', 'nft', 'web3', 'defi',
-            'quantum computing', 'iot', 'edge computing', 'ar', 'vr',
-            'metaverse', '5g', 'cybersecurity', 'zero trust'
-        ]
-        
-        found_skills = {
-            "programming_languages": [skill for skill in programming_languages if skill in text_lower],
-            "frameworks": [skill for skill in frameworks if skill in text_lower],
-            "databases": [skill for skill in databases if skill in text_lower],
-            "cloud_devops": [skill for skill in cloud_devops if skill in text_lower],
-            "hardware_engineering": [skill for skill in hardware_engineering if skill in text_lower],
-            "ai_ml": [skill for skill in ai_ml if skill in text_lower],
-            "development_tools": [skill for skill in development_tools if skill in text_lower],
-            "web_technologies": [skill for skill in web_technologies if skill in text_lower],
-            "soft_skills": [skill for skill in soft_skills if skill in text_lower],
-            "certifications": [skill for skill in certifications if skill in text_lower],
-            "emerging_tech": [skill for skill in emerging_tech if skill in text_lower]
-        }
-        
-        return found_skills
-    
-    @staticmethod
-    def _extract_education(text: str) -> List[str]:
-        """Extract education information"""
-        education_keywords = [
-            'bachelor', 'master', 'phd', 'degree', 'university', 'college',
-            'computer science', 'computer engineering', 'software engineering',
-            'data science', 'information technology', 'cybersecurity'
-        ]
-        
-        found_education = []
-        text_lower = text.lower()
-        
-        for keyword in education_keywords:
-            if keyword in text_lower:
-                found_education.append(keyword)
-        
-        return list(set(found_education))  # Remove duplicates
-    
-    @staticmethod
-    def _extract_experience(text: str) -> Dict[str, List[str]]:
-        """Extract work experience keywords"""
-        text_lower = text.lower()
-        
-        experience_levels = ['intern', 'junior', 'senior', 'lead', 'manager', 'director']
-        job_types = [
-            'software engineer', 'developer', 'programmer', 'analyst',
-            'data scientist', 'devops', 'full stack', 'frontend', 'backend',
-            'mobile developer', 'web developer', 'qa', 'tester'
-        ]
-        
-        found_experience = {
-            "levels": [level for level in experience_levels if level in text_lower],
-            "roles": [role for role in job_types if role in text_lower]
-        }
-        
-        return found_experience
\ No newline at end of file
+        return get_taxonomy().matcher.extract(text)
@@ -0,0 +1,143 @@
+# app/services/resume_scanner.py
+import re
+from typing import Dict, List, NamedTuple
+from app.services.skill_matcher import LEFT_BOUNDARY, RIGHT_BOUNDARY, build_trie_pattern
+from app.services.text_normalizer import NormalizedText
+
+EDUCATION_KEYWORDS = [
+    'bachelor', 'master', 'phd', 'degree', 'university', 'college',
+    'computer science', 'computer engineering', 'software engineering',
+    'data science', 'information technology', 'cybersecurity'
+]
+
+EXPERIENCE_LEVELS = ['intern', 'junior', 'senior', 'lead', 'manager', 'director']
+
+JOB_TYPES = [
+    'software engineer', 'developer', 'programmer', 'analyst',
+    'data scientist', 'devops', 'full stack', 'frontend', 'backend',
+    'mobile developer', 'web developer', 'qa', 'tester'
+]
+
+# Heading text (lowercase) -> section it opens
+SECTION_HEADINGS = {
+    'education': 'education',
+    'academic background': 'education',
+    'education and training': 'education',
+    'experience': 'experience',
+    'work experience': 'experience',
+    'professional experience': 'experience',
+    'relevant experience': 'experience',
+    'employment': 'experience',
+    'employment history': 'experience',
+    'work history': 'experience',
+    'skills': 'skills',
+    'technical skills': 'skills',
+    'core competencies': 'skills',
+    'technologies': 'skills',
+    'projects': 'projects',
+    'personal projects': 'projects',
+    'academic projects': 'projects',
+    'selected projects': 'projects'
+}
+
+# Keyword -> which result list it belongs to
+_KEYWORD_KINDS: Dict[str, str] = {
+    **{keyword: 'education' for keyword in EDUCATION_KEYWORDS},
+    **{level: 'levels' for level in EXPERIENCE_LEVELS},
+    **{role: 'roles' for role in JOB_TYPES}
+}
+
+# A scan consumes the longest keyword at each position ('web developer'), so
+# precompute the shorter keywords each one also implies ('developer')
+_IMPLIED_KEYWORDS: Dict[str, List[str]] = {
+    keyword: [
+        other for other in _KEYWORD_KINDS
+        if other != keyword and re.search(LEFT_BOUNDARY + re.escape(other) + RIGHT_BOUNDARY, keyword)
+    ]
+    for keyword in _KEYWORD_KINDS
+}
+
+# One alternation for everything the scan looks for, run against normalized
+# (casefolded, whitespace-collapsed) text. Order matters where two alternatives could start at the same character:
+# headings own their line, and emails are tried before keywords so
+# 'developer@x.com' stays an email.
+_HEADING_SOURCE = r'^[ \t]*(?P<heading>' + build_trie_pattern(list(SECTION_HEADINGS)) + r')[ \t]*:?[ \t]*$'
+_SCAN_SOURCE = (
+    _HEADING_SOURCE +
+    r'|(?P<email>\b[a-z0-9._%+-]++@[a-z0-9.-]+\.[a-z|]{2,}\b)'
+    r'|(?P<phone>\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})'
+    # Plurals and '-ship' still count ('internship', 'developers')
+    r'|' + LEFT_BOUNDARY + r'(?P<keyword>' + build_trie_pattern(list(_KEYWORD_KINDS)) + r')(?:s|ships?)?' + RIGHT_BOUNDARY
+)
+_SCAN_PATTERN = re.compile(_SCAN_SOURCE, re.MULTILINE)
+
+class Section(NamedTuple):
+    """A resume section in normalized-text offsets, from its heading to the next heading"""
+    name: str
+    start: int
+    heading_end: int
+    end: int
+
+class ScanResult(NamedTuple):
+    emails: List[str]
+    phones: List[str]
+    sections: List[Dict]
+    education: List[str]
+    levels: List[str]
+    roles: List[str]
+    # The same sections in normalized-text offsets, for later stages (e.g. the experience timeline)
+    section_bounds: List[Section]
+
+def scan_resume(document: NormalizedText) -> ScanResult:
+    """Find contacts, section headings and education/experience keywords in one pass over a document.
+
+    Sections run from their heading to the next heading (or the end of the
+    text), as character offsets into the original text. Emails, phones and
+    headings are reported as written in the original; keywords are reported
+    once each, in order of first appearance.
+    """
+    text = document.text
+    emails: List[str] = []
+    phones: List[str] = []
+    sections: List[Section] = []
+    hits: Dict[str, Dict[str, None]] = {'education': {}, 'levels': {}, 'roles': {}}
+
+    for match in _SCAN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        start, end = match.span(kind)
+        if kind == 'keyword':
+            keyword = text[start:end]
+            hits[_KEYWORD_KINDS[keyword]][keyword] = None
+            for implied in _IMPLIED_KEYWORDS[keyword]:
+                hits[_KEYWORD_KINDS[implied]][implied] = None
+        elif kind == 'email':
+            emails.append(document.original_text(start, end))
+        elif kind == 'phone':
+            phones.append(document.original_text(start, end))
+        else:
+            _open_section(sections, text, match)
+
+    return ScanResult(
+        emails=emails,
+        phones=phones,
+        sections=[
+            {
+                'name': section.name,
+                'heading': document.original_text(section.start, section.heading_end),
+                'start': document.original_start(section.start),
+                'end': document.original_end(section.end)
+            }
+            for section in sections
+        ],
+        education=list(hits['education']),
+        levels=list(hits['levels']),
+        roles=list(hits['roles']),
+        section_bounds=sections
+    )
+
+def _open_section(sections: List[Section], text: str, match: re.Match) -> None:
+    """Close the previous section at this heading's line and start a new one"""
+    start, end = match.span('heading')
+    if sections:
+        sections[-1] = sections[-1]._replace(end=match.start())
+    sections.append(Section(SECTION_HEADINGS[text[start:end]], start, end, len(text)))
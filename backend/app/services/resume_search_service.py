@@ -0,0 +1,266 @@
+# app/services/resume_search_service.py
+import re
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+from app.services.skill_taxonomy import get_taxonomy
+
+class QuerySyntaxError(ValueError):
+    pass
+
+class _GrowableArray:
+    """A numpy array with amortised O(1) appends; view() exposes the filled prefix"""
+    __slots__ = ('data', 'size')
+
+    def __init__(self, dtype, capacity: int = 8):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def append(self, value) -> None:
+        if self.size == len(self.data):
+            grown = np.empty(len(self.data) * 2, dtype=self.data.dtype)
+            grown[:self.size] = self.data
+            self.data = grown
+        self.data[self.size] = value
+        self.size += 1
+
+    def view(self) -> np.ndarray:
+        return self.data[:self.size]
+
+# Posting lists are sorted id arrays: ids are handed out in increasing order,
+# so appending keeps them sorted. The set operations below rely on that and
+# probe the longer list with searchsorted, O(m log n) rather than a merge sort.
+
+def _contains(haystack: np.ndarray, needles: np.ndarray) -> np.ndarray:
+    """Boolean mask of which needles occur in the sorted haystack"""
+    if len(haystack) == 0:
+        return np.zeros(len(needles), dtype=bool)
+    positions = np.searchsorted(haystack, needles)
+    positions[positions == len(haystack)] = 0
+    return haystack[positions] == needles
+
+def intersect_sorted(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    if len(first) > len(second):
+        first, second = second, first
+    return first[_contains(second, first)]
+
+def union_sorted(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    # np.union1d goes through np.unique, which is an order of magnitude slower than sort + adjacent compare
+    merged = np.concatenate((first, second))
+    merged.sort()
+    if len(merged) == 0:
+        return merged
+    return merged[np.concatenate(([True], merged[1:] != merged[:-1]))]
+
+def difference_sorted(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    return first[~_contains(second, first)]
+
+# Query AST: ('term', name) | ('not', node) | ('and', [nodes]) | ('or', [nodes])
+QueryNode = Tuple[str, Union[str, 'QueryNode', List['QueryNode']]]
+
+_QUERY_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+_OPERATORS = {'and', 'or', 'not'}
+# Bounds on what parse_query accepts, so a hostile query can't exhaust the recursive parser
+MAX_QUERY_LENGTH = 1000
+MAX_QUERY_DEPTH = 32
+
+def parse_query(query: str) -> QueryNode:
+    """Parse a boolean skill query such as 'python AND (aws OR gcp) AND NOT intern'.
+
+    Operators are case-insensitive, adjacent terms are ANDed, and multi-word
+    terms are written in double quotes ("machine learning"). Queries over
+    MAX_QUERY_LENGTH characters or nested (parentheses and NOTs) deeper than
+    MAX_QUERY_DEPTH are rejected.
+    """
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    query = query.strip()
+    if len(query) > MAX_QUERY_LENGTH:
+        raise QuerySyntaxError(f"Query is longer than {MAX_QUERY_LENGTH} characters")
+    while position < len(query):
+        match = _QUERY_TOKEN.match(query, position)
+        if match is None:
+            raise QuerySyntaxError(f"Unexpected character at position {position}")
+        position = match.end()
+        opening, closing, quoted, word = match.groups()
+        if opening:
+            tokens.append(('(', opening))
+        elif closing:
+            tokens.append((')', closing))
+        elif quoted is not None:
+            tokens.append(('term', quoted))
+        elif word.lower() in _OPERATORS:
+            tokens.append((word.lower(), word))
+        else:
+            tokens.append(('term', word))
+
+    if not tokens:
+        raise QuerySyntaxError("Query is empty")
+
+    index = 0
+    depth = 0
+
+    def peek() -> Optional[str]:
+        return tokens[index][0] if index < len(tokens) else None
+
+    def advance() -> Tuple[str, str]:
+        nonlocal index
+        index += 1
+        return tokens[index - 1]
+
+    def parse_or() -> QueryNode:
+        children = [parse_and()]
+        while peek() == 'or':
+            advance()
+            children.append(parse_and())
+        return children[0] if len(children) == 1 else ('or', children)
+
+    def parse_and() -> QueryNode:
+        children = [parse_not()]
+        while peek() in ('and', 'not', 'term', '('):
+            if peek() == 'and':
+                advance()
+            children.append(parse_not())
+        return children[0] if len(children) == 1 else ('and', children)
+
+    def nested(parse: Callable[[], QueryNode]) -> QueryNode:
+        nonlocal depth
+        depth += 1
+        if depth > MAX_QUERY_DEPTH:
+            raise QuerySyntaxError(f"Query is nested deeper than {MAX_QUERY_DEPTH} levels")
+        try:
+            return parse()
+        finally:
+            depth -= 1
+
+    def parse_not() -> QueryNode:
+        if peek() == 'not':
+            advance()
+            return ('not', nested(parse_not))
+        return parse_primary()
+
+    def parse_primary() -> QueryNode:
+        kind = peek()
+        if kind == '(':
+            advance()
+            node = nested(parse_or)
+            if peek() != ')':
+                raise QuerySyntaxError("Missing closing parenthesis")
+            advance()
+            return node
+        if kind == 'term':
+            return ('term', advance()[1])
+        found = tokens[index][1] if index < len(tokens) else "end of query"
+        raise QuerySyntaxError(f"Expected a term, found '{found}'")
+
+    node = parse_or()
+    if index < len(tokens):
+        raise QuerySyntaxError(f"Unexpected '{tokens[index][1]}'")
+    return node
+
+def normalize_term(term: str) -> str:
+    """Index and query terms are lowercase, with skill aliases resolved to the canonical skill"""
+    term = " ".join(term.lower().split())
+    return get_taxonomy().canonical(term) or term
+
+def resume_terms(parsed: Dict) -> Iterable[str]:
+    """Every searchable term of a parse result: skills plus education and experience keywords"""
+    for skills in parsed.get('skills', {}).values():
+        yield from skills
+    yield from parsed.get('education', [])
+    experience = parsed.get('experience', {})
+    yield from experience.get('levels', [])
+    yield from experience.get('roles', [])
+
+class ResumeSearchIndex:
+    """In-process inverted index of parsed resumes, keyed by skill and keyword terms"""
+
+    def __init__(self):
+        self._documents: List[Optional[Dict]] = []
+        self._live = _GrowableArray(bool)
+        self._ids_by_hash: Dict[str, int] = {}
+        self._postings: Dict[str, _GrowableArray] = {}
+
+    def add(self, parsed: Dict) -> int:
+        """Index a parse result, replacing any earlier entry for the same file"""
+        content_hash = parsed['content_hash']
+        previous = self._ids_by_hash.get(content_hash)
+        if previous is not None:
+            if self._documents[previous].get('taxonomy_version') == parsed.get('taxonomy_version'):
+                return previous
+            # Re-parsed under a different taxonomy: retire the old entry, its postings stay but no longer match
+            self._documents[previous] = None
+            self._live.data[previous] = False
+
+        doc_id = len(self._documents)
+        terms = sorted({normalize_term(term) for term in resume_terms(parsed)})
+        # The content hash is left out of results: it's the key to the resume's full text
+        self._documents.append({
+            "filename": parsed.get('filename'),
+            "skills": [skill for skills in parsed.get('skills', {}).values() for skill in skills],
+            "taxonomy_version": parsed.get('taxonomy_version'),
+            "indexed_at": datetime.utcnow().isoformat()
+        })
+        self._live.append(True)
+        self._ids_by_hash[content_hash] = doc_id
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = _GrowableArray(np.int32)
+            postings.append(doc_id)
+        return doc_id
+
+    def _all_ids(self, excluding: Optional[np.ndarray] = None) -> np.ndarray:
+        mask = self._live.view()
+        if excluding is not None:
+            mask = mask.copy()
+            mask[excluding] = False
+        return np.flatnonzero(mask).astype(np.int32)
+
+    def _evaluate(self, node: QueryNode) -> np.ndarray:
+        kind = node[0]
+        if kind == 'term':
+            postings = self._postings.get(normalize_term(node[1]))
+            return postings.view() if postings is not None else np.empty(0, dtype=np.int32)
+        if kind == 'not':
+            return self._all_ids(excluding=self._evaluate(node[1]))
+        if kind == 'or':
+            result = self._evaluate(node[1][0])
+            for child in node[1][1:]:
+                result = union_sorted(result, self._evaluate(child))
+            return result
+
+        # AND: intersect the positive lists smallest first, then subtract the negated ones
+        positive = sorted((self._evaluate(child) for child in node[1] if child[0] != 'not'), key=len)
+        negative = [self._evaluate(child[1]) for child in node[1] if child[0] == 'not']
+        result = positive[0] if positive else self._all_ids()
+        for postings in positive[1:]:
+            if len(result) == 0:
+                break
+            result = intersect_sorted(result, postings)
+        for postings in negative:
+            result = difference_sorted(result, postings)
+        return result
+
+    def search(self, query: str, offset: int = 0, limit: int = 20) -> Dict:
+        """Evaluate a boolean query and return one page of matches, newest first"""
+        matches = self._evaluate(parse_query(query))
+        live = self._live.view()
+        matches = matches[live[matches]]
+        page = matches[::-1][offset:offset + limit]
+        return {
+            "query": query,
+            "total": int(len(matches)),
+            "offset": offset,
+            "limit": limit,
+            "results": [self._documents[doc_id] for doc_id in page.tolist()]
+        }
+
+    def stats(self) -> Dict:
+        return {
+            "documents": int(np.count_nonzero(self._live.view())),
+            "terms": len(self._postings)
+        }
+
+resume_index = ResumeSearchIndex()
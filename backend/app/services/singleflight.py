@@ -0,0 +1,62 @@
+# app/services/singleflight.py
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one shared in-flight task.
+
+    The first caller for a key starts the work; callers that arrive while it's
+    running await the same task and get the same result or exception. A key
+    is forgotten as soon as its task finishes, so a failure is only shared
+    with callers that were already waiting and the next call starts afresh.
+
+    Callers await the task through asyncio.shield: a caller that is cancelled
+    (e.g. its client disconnected) stops waiting, but the shared work carries
+    on for everyone else.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def start(self, key: Hashable, work: Callable[[], Awaitable[T]]) -> "asyncio.Task[T]":
+        """Return the in-flight task for key, starting work() if there is none"""
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+
+        self.started += 1
+        task = asyncio.ensure_future(work())
+        self._calls[key] = task
+        task.add_done_callback(lambda finished: self._finish(key, finished))
+        return task
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[T]]) -> T:
+        """Run work() for key, or join the run already in flight, and return its result"""
+        return await asyncio.shield(self.start(key, work))
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieve the exception so work nobody waited on (a background start(), or
+        # one whose callers were all cancelled) doesn't fail silently
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("%s call for %s failed: %s", self.name, key, task.exception())
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": len(self._calls),
+            "started": self.started,
+            "coalesced": self.coalesced
+        }
@@ -0,0 +1,89 @@
+# app/services/skill_matcher.py
+import re
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+# A skill only counts when it is not glued to a neighbouring word, so 'c' does
+# not fire inside 'cloud' and 'java' does not fire inside 'javascript'
+LEFT_BOUNDARY = r'(?<![a-z0-9_])'
+RIGHT_BOUNDARY = r'(?![a-z0-9_+#])'
+
+
+class SkillMatch(NamedTuple):
+    skill: str
+    categories: Tuple[str, ...]
+    start: int
+    end: int
+
+
+def build_trie_pattern(terms: List[str]) -> str:
+    """Build a regex alternation factored as a trie so the engine branches once per character"""
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def to_regex(node: Dict) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + to_regex(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        # Optional groups are greedy, so the longest skill is tried first and
+        # the engine only falls back to a shorter one if the boundary fails
+        return group + '?' if terminal else group
+
+    return to_regex(trie)
+
+
+class SkillMatcher:
+    """Finds every taxonomy skill in a document with one compiled regex pass"""
+
+    def __init__(
+        self,
+        categories: Tuple[str, ...],
+        skill_categories: Mapping[str, Tuple[str, ...]],
+        aliases: Optional[Mapping[str, str]] = None
+    ):
+        self.categories = categories
+        self.skill_categories = skill_categories
+        # Every surface form (canonical name or alias) resolves to its canonical skill
+        # inside the same scan, so there is no second normalization pass
+        self.surface_forms: Dict[str, str] = {skill: skill for skill in skill_categories}
+        for alias, canonical in (aliases or {}).items():
+            self.surface_forms.setdefault(alias, canonical)
+        self.pattern = re.compile(
+            LEFT_BOUNDARY + '(?:' + build_trie_pattern(list(self.surface_forms)) + ')' + RIGHT_BOUNDARY,
+            re.IGNORECASE | re.ASCII
+        )
+
+    def find_all(self, text: str) -> List[SkillMatch]:
+        """Return every skill occurrence as its canonical skill, with categories and character offsets"""
+        surface_forms = self.surface_forms
+        skill_categories = self.skill_categories
+        return [
+            SkillMatch(skill, skill_categories[skill], match.start(), match.end())
+            for match in self.pattern.finditer(text)
+            for skill in (surface_forms[match.group().lower()],)
+        ]
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        """Group the unique skills found in text by category"""
+        found: Dict[str, List[str]] = {category: [] for category in self.categories}
+        seen = set()
+        for match in self.find_all(text):
+            if match.skill in seen:
+                continue
+            seen.add(match.skill)
+            for category in match.categories:
+                found[category].append(match.skill)
+        return found
+
+    def extract_unique(self, text: str) -> List[str]:
+        """Return the unique skills found in text, in order of first appearance"""
+        return list(dict.fromkeys(match.skill for match in self.find_all(text)))
+
@@ -0,0 +1,217 @@
+# app/services/skill_taxonomy.py
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+from app.config import settings
+from app.services.skill_matcher import SkillMatcher
+
+logger = logging.getLogger(__name__)
+
+_HEX_VECTOR = re.compile(r'[0-9a-fA-F]*')
+
+class TaxonomyMismatchError(ValueError):
+    """A skill vector was encoded under a different taxonomy version than the one loaded"""
+
+@dataclass(frozen=True)
+class SkillTaxonomy:
+    """Immutable, compiled view of the skill taxonomy file"""
+    version: str
+    categories: Tuple[str, ...]
+    category_labels: Mapping[str, str]
+    skills: Tuple[str, ...]
+    skill_categories: Mapping[str, Tuple[str, ...]]
+    skill_ids: Mapping[str, int]
+    aliases: Mapping[str, str]
+    emerging: FrozenSet[str]
+    matcher: SkillMatcher
+
+    def canonical(self, name: str) -> Optional[str]:
+        """Resolve a skill name or alias to its canonical skill, or None if unknown"""
+        key = name.strip().lower()
+        if key in self.skill_categories:
+            return key
+        return self.aliases.get(key)
+
+    def to_vector(self, skills: Iterable[str]) -> int:
+        """Pack skills into a bitmap indexed by skill id; unknown skills are ignored.
+        
+        Ids are positions in the file counted across all categories, so any
+        edit to the taxonomy can renumber skills: a vector is only meaningful
+        alongside the taxonomy version that produced it.
+        """
+        skill_ids = self.skill_ids
+        vector = 0
+        for skill in skills:
+            skill_id = skill_ids.get(skill)
+            if skill_id is None:
+                canonical = self.canonical(skill)
+                if canonical is None:
+                    continue
+                skill_id = skill_ids[canonical]
+            vector |= 1 << skill_id
+        return vector
+
+    def parse_vector(self, encoded: str, version: str) -> int:
+        """Decode a client-supplied hex skill vector that was encoded under taxonomy version.
+        
+        Raises TaxonomyMismatchError if version isn't the loaded one and
+        ValueError if encoded isn't plain hex or sets bits past the last skill id.
+        """
+        if version != self.version:
+            raise TaxonomyMismatchError(
+                f"Skill vector was encoded with taxonomy {version}, but {self.version} is loaded; re-parse the resume"
+            )
+        if not _HEX_VECTOR.fullmatch(encoded):
+            raise ValueError("Skill vector must be a hex string")
+        vector = decode_vector(encoded)
+        if vector.bit_length() > len(self.skills):
+            raise ValueError(f"Skill vector has bits past the taxonomy's {len(self.skills)} skills")
+        return vector
+
+    def from_vector(self, vector: int) -> List[str]:
+        """Unpack a skill bitmap back into canonical skill names, in id order"""
+        skills = self.skills
+        found = []
+        while vector:
+            lowest = vector & -vector
+            found.append(skills[lowest.bit_length() - 1])
+            vector ^= lowest
+        return found
+
+    def text_vector(self, text: str) -> int:
+        """Bitmap of every skill mentioned in text"""
+        skill_ids = self.skill_ids
+        vector = 0
+        for match in self.matcher.find_all(text):
+            vector |= 1 << skill_ids[match.skill]
+        return vector
+
+    def primary_category(self, skill: str) -> Optional[str]:
+        """The first category a skill is listed under"""
+        categories = self.skill_categories.get(skill)
+        return categories[0] if categories else None
+
+    def category_label(self, category: str) -> str:
+        return self.category_labels.get(category, category)
+
+def encode_vector(vector: int) -> str:
+    """Hex form of a skill bitmap for JSON responses and storage"""
+    return format(vector, 'x')
+
+def decode_vector(encoded: str) -> int:
+    return int(encoded, 16) if encoded else 0
+
+def compile_taxonomy(data: Dict, version: str) -> SkillTaxonomy:
+    """Validate raw taxonomy data and build the lookup tables and matcher"""
+    skill_categories: Dict[str, List[str]] = {}
+    category_labels: Dict[str, str] = {}
+
+    for category in data["categories"]:
+        category_id = category["id"]
+        category_labels[category_id] = category.get("label", category_id)
+        for skill in category["skills"]:
+            categories = skill_categories.setdefault(skill.lower(), [])
+            if category_id not in categories:
+                categories.append(category_id)
+
+    aliases = {}
+    for canonical, surface_forms in data.get("aliases", {}).items():
+        if canonical.lower() not in skill_categories:
+            raise ValueError(f"Aliases given for unknown skill '{canonical}'")
+        for alias in surface_forms:
+            alias = alias.lower()
+            if alias in skill_categories or aliases.get(alias, canonical.lower()) != canonical.lower():
+                raise ValueError(f"Alias '{alias}' is ambiguous")
+            aliases[alias] = canonical.lower()
+
+    emerging = frozenset(skill.lower() for skill in data.get("emerging", []))
+    unknown = emerging - skill_categories.keys()
+    if unknown:
+        raise ValueError(f"Emerging skills not in taxonomy: {sorted(unknown)}")
+
+    categories = tuple(category_labels)
+    frozen_skill_categories = MappingProxyType(
+        {skill: tuple(cats) for skill, cats in skill_categories.items()}
+    )
+
+    return SkillTaxonomy(
+        version=version,
+        categories=categories,
+        category_labels=MappingProxyType(category_labels),
+        skills=tuple(frozen_skill_categories),
+        skill_categories=frozen_skill_categories,
+        skill_ids=MappingProxyType({skill: index for index, skill in enumerate(frozen_skill_categories)}),
+        aliases=MappingProxyType(aliases),
+        emerging=emerging,
+        matcher=SkillMatcher(categories, frozen_skill_categories, aliases)
+    )
+
+class _TaxonomyLoader:
+    """Loads the taxonomy file once and swaps in a new compiled copy when it changes on disk"""
+
+    def __init__(self, path: str, reload_seconds: float):
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self._taxonomy: Optional[SkillTaxonomy] = None
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> SkillTaxonomy:
+        taxonomy = self._taxonomy
+        if taxonomy is None:
+            return self.reload()
+        if self.reload_seconds > 0 and time.monotonic() - self._checked_at >= self.reload_seconds:
+            return self.reload()
+        return taxonomy
+
+    def reload(self, force: bool = False) -> SkillTaxonomy:
+        """Recompile if the file changed (or always, with force).
+
+        A broken file never replaces a working taxonomy: the error is logged and
+        the previous version stays live.
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                stat = os.stat(self.path)
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                if not force and self._taxonomy is not None and stamp == self._file_stamp:
+                    return self._taxonomy
+
+                with open(self.path, "rb") as f:
+                    raw = f.read()
+                data = json.loads(raw)
+                version = f"{data.get('version', '0')}-{hashlib.sha256(raw).hexdigest()[:8]}"
+                taxonomy = compile_taxonomy(data, version)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                if self._taxonomy is None:
+                    raise
+                logger.error("Keeping skill taxonomy %s; reload failed: %s", self._taxonomy.version, e)
+                return self._taxonomy
+
+            if self._taxonomy is None or taxonomy.version != self._taxonomy.version:
+                logger.info("Loaded skill taxonomy %s (%d skills)", taxonomy.version, len(taxonomy.skills))
+            self._taxonomy = taxonomy
+            self._file_stamp = stamp
+            return taxonomy
+
+_loader = _TaxonomyLoader(settings.SKILL_TAXONOMY_PATH, settings.SKILL_TAXONOMY_RELOAD_SECONDS)
+
+def get_taxonomy() -> SkillTaxonomy:
+    """Current compiled taxonomy; cheap enough to call on every request"""
+    return _loader.get()
+
+def reload_taxonomy(force: bool = False) -> SkillTaxonomy:
+    """Re-read the taxonomy file now instead of waiting for the reload interval"""
+    return _loader.reload(force=force)
+
+# Compile at import time so the first request doesn't pay for it
+get_taxonomy()
@@ -0,0 +1,106 @@
+# app/services/text_normalizer.py
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple
+
+# Everything in extracted text that normalization rewrites. Any stretch between
+# two matches is plain ASCII that only needs lowercasing, which keeps its length,
+# so those stretches map back to the original one-to-one.
+_REWRITE = re.compile(
+    # 'plat-\nform' -> 'platform': a hyphen (or soft hyphen) ending a line inside a word
+    r'(?P<hyphen>(?<=[^\W\d_])[-\u00ad][^\S\n]*\n\s*(?=[a-z]))'
+    # Trailing spaces, blank lines and indentation around line breaks -> '\n'
+    r'|(?P<newline>[^\S\n]+\n\s*|\n\s+)'
+    # Runs of spaces, tabs, NBSPs and other Unicode spaces -> ' '
+    r'|(?P<space>[^\S\n]{2,}|[^\S\n ])'
+    r'|(?P<soft_hyphen>\u00ad)'
+    # Ligatures, full-width forms, accented letters: NFKC + casefold. A preceding
+    # ASCII letter is included so combining marks compose with it.
+    r'|(?P<unicode>[A-Za-z]?[^\x00-\x7f\s\u00ad]+)'
+)
+_REPLACEMENTS = {'hyphen': '', 'newline': '\n', 'space': ' ', 'soft_hyphen': ''}
+
+class NormalizedText:
+    """Extracted text normalized for matching, with a map from its offsets back to the original.
+
+    text is NFKC-normalized and casefolded, with line-break hyphenation undone
+    and whitespace collapsed. Every extractor matches against text and uses
+    original_span / original_text to report positions and values from the
+    original.
+
+    The offset map is piecewise: a list of segments that are either copied
+    (offsets shift by a constant) or rewritten (every offset inside maps to
+    the rewritten stretch of the original as a whole).
+    """
+    __slots__ = ('original', 'text', '_norm_starts', '_orig_starts', '_copied')
+
+    def __init__(self, original: str, text: str, norm_starts: List[int], orig_starts: List[int], copied: List[bool]):
+        self.original = original
+        self.text = text
+        self._norm_starts = norm_starts
+        self._orig_starts = orig_starts
+        self._copied = copied
+
+    def _segment_end(self, index: int) -> int:
+        return self._orig_starts[index + 1] if index + 1 < len(self._orig_starts) else len(self.original)
+
+    def original_start(self, position: int) -> int:
+        """Original offset of the character at a normalized offset"""
+        index = bisect_right(self._norm_starts, position) - 1
+        if index < 0:
+            return 0
+        if self._copied[index]:
+            return min(self._orig_starts[index] + position - self._norm_starts[index], self._segment_end(index))
+        return self._orig_starts[index]
+
+    def original_end(self, position: int) -> int:
+        """Original offset just past the character before a normalized offset"""
+        index = bisect_left(self._norm_starts, position) - 1
+        if index < 0:
+            return 0
+        if self._copied[index]:
+            return min(self._orig_starts[index] + position - self._norm_starts[index], self._segment_end(index))
+        return self._segment_end(index)
+
+    def original_span(self, start: int, end: int) -> Tuple[int, int]:
+        return self.original_start(start), self.original_end(end)
+
+    def original_text(self, start: int, end: int) -> str:
+        """The original text behind a normalized span, e.g. an email with its case intact"""
+        original_start, original_end = self.original_span(start, end)
+        return self.original[original_start:original_end].strip()
+
+def normalize_text(text: str) -> NormalizedText:
+    """Normalize extracted text in one pass, recording the offset map as it goes"""
+    chunks: List[str] = []
+    norm_starts: List[int] = []
+    orig_starts: List[int] = []
+    copied: List[bool] = []
+    norm_position = 0
+    orig_position = 0
+
+    def emit(chunk: str, orig_start: int, is_copy: bool) -> None:
+        nonlocal norm_position
+        norm_starts.append(norm_position)
+        orig_starts.append(orig_start)
+        copied.append(is_copy)
+        chunks.append(chunk)
+        norm_position += len(chunk)
+
+    for match in _REWRITE.finditer(text):
+        start, end = match.span()
+        if start > orig_position:
+            emit(text[orig_position:start].lower(), orig_position, True)
+        kind = match.lastgroup
+        if kind == 'unicode':
+            replacement = unicodedata.normalize('NFKC', match.group()).casefold()
+        else:
+            replacement = _REPLACEMENTS[kind]
+        emit(replacement, start, False)
+        orig_position = end
+
+    if orig_position < len(text):
+        emit(text[orig_position:].lower(), orig_position, True)
+
+    return NormalizedText(text, "".join(chunks), norm_starts, orig_starts, copied)
@@ -0,0 +1,294 @@
+# app/services/upload_service.py
+import codecs
+import hashlib
+import io
+import os
+import re
+import tempfile
+import zipfile
+from typing import BinaryIO, Dict, Optional
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+CHUNK_SIZE = 64 * 1024
+
+# Allowance for multipart boundaries and part headers on top of a body size limit
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# How much of the start of a document sniff_format looks at
+SNIFF_BYTES = 1024
+
+# Byte-order marks, longest first (the UTF-32-LE mark starts with the UTF-16-LE one)
+_BOM_CODECS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+)
+# How much of a BOM-less document the UTF-16 heuristic samples, and the least it will judge
+_UTF16_SAMPLE_BYTES = 4096
+_UTF16_MIN_BYTES = 8
+# Bytes cp1252 leaves undefined; text containing any is decoded as Latin-1 instead
+_CP1252_UNDEFINED = re.compile(b'[\x81\x8d\x8f\x90\x9d]')
+
+class UploadTooLargeError(ValueError):
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB")
+        self.max_bytes = max_bytes
+
+class UnsupportedFormatError(ValueError):
+    def __init__(self):
+        super().__init__("Unsupported file type. Please upload PDF, DOCX, or TXT files.")
+
+def sniff_format(head: bytes) -> Optional[str]:
+    """Document format from its first bytes: 'pdf', 'docx', 'txt', or None for anything else.
+
+    The filename is not consulted. PDFs may carry up to 1 KB of junk before
+    their header; DOCX is recognised as a zip container here, and once the
+    whole upload is in (see is_docx_package) by its word/document.xml part;
+    text is anything without NUL bytes, or UTF-16/32 (which is full of
+    them) recognised by BOM or byte pattern.
+    """
+    head = head[:SNIFF_BYTES]
+    if b'%PDF-' in head:
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04'):
+        return 'docx'
+    if b'\x00' not in head or _bom_codec(head) or _utf16_codec(head):
+        return 'txt'
+    return None
+
+def is_docx_package(stream: BinaryIO) -> bool:
+    """Whether a zip sniffed as 'docx' is a Word document, not e.g. a spreadsheet or a plain archive"""
+    try:
+        with zipfile.ZipFile(stream) as package:
+            return any(name == 'word/document.xml' for name in package.namelist())
+    except zipfile.BadZipFile:
+        return False
+
+def _bom_codec(data: bytes) -> Optional[str]:
+    for bom, codec in _BOM_CODECS:
+        if data.startswith(bom):
+            return codec
+    return None
+
+def _utf16_codec(data: bytes) -> Optional[str]:
+    """'utf-16-le' / 'utf-16-be' if data looks like BOM-less UTF-16, else None.
+
+    Mostly-ASCII UTF-16 has a NUL in every other byte: the odd positions for
+    little-endian, the even ones for big-endian, and almost none in the other half.
+    Samples shorter than a few characters are never judged UTF-16.
+    """
+    sample = data[:_UTF16_SAMPLE_BYTES]
+    if len(sample) < _UTF16_MIN_BYTES:
+        return None
+    pairs = len(sample) // 2
+    even_nuls = sample[0::2].count(0)
+    odd_nuls = sample[1::2].count(0)
+    if odd_nuls > 0 and odd_nuls >= pairs // 2 and even_nuls <= pairs // 16:
+        return 'utf-16-le'
+    if even_nuls > 0 and even_nuls >= pairs // 2 and odd_nuls <= pairs // 16:
+        return 'utf-16-be'
+    return None
+
+def decode_text(data: bytes) -> str:
+    """Decode a plain-text document of unknown encoding, decoding the bytes once.
+
+    A BOM decides outright, then the NUL pattern of BOM-less UTF-16 (which
+    would otherwise pass as UTF-8). Next strict UTF-8 is tried, failing fast
+    at the first invalid byte; anything else is cp1252 (Latin-1 plus smart
+    quotes and dashes), or Latin-1 when the bytes aren't valid cp1252.
+    Decoding never fails, so a file in an odd encoding yields some text
+    rather than an error.
+    """
+    codec = _bom_codec(data) or _utf16_codec(data)
+    if codec is not None:
+        return str(data, codec, 'replace')
+    try:
+        return str(data, 'utf-8')
+    except UnicodeDecodeError:
+        pass
+    if _CP1252_UNDEFINED.search(data):
+        return str(data, 'latin-1')
+    return str(data, 'cp1252')
+
+class _Spooler:
+    """Accumulates chunks under a size cap, hashing them and spilling to disk past a threshold"""
+
+    def __init__(self, max_bytes: int, spool_threshold: int):
+        self.max_bytes = max_bytes
+        self.spool_threshold = spool_threshold
+        self.digest = hashlib.sha256()
+        self.buffer = bytearray()
+        self.head = b''
+        self.spool = None
+        self.size = 0
+
+    def feed(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLargeError(self.max_bytes)
+        self.digest.update(chunk)
+
+        if len(self.head) < SNIFF_BYTES:
+            self.head += chunk[:SNIFF_BYTES - len(self.head)]
+            # Refuse unsupported content as soon as we've seen enough of it, not after the whole body
+            if len(self.head) == SNIFF_BYTES and sniff_format(self.head) is None:
+                raise UnsupportedFormatError()
+
+        if self.spool is None and len(self.buffer) + len(chunk) > self.spool_threshold:
+            self.spool = tempfile.NamedTemporaryFile(prefix="upload-", delete=False)
+            self.spool.write(self.buffer)
+            self.buffer = bytearray()
+
+        if self.spool is not None:
+            self.spool.write(chunk)
+        else:
+            self.buffer += chunk
+
+    def finish(self) -> "SpooledUpload":
+        kind = sniff_format(self.head)
+        if kind is None:
+            raise UnsupportedFormatError()
+        if self.spool is not None:
+            self.spool.close()
+            upload = SpooledUpload(self.size, self.digest.hexdigest(), path=self.spool.name, kind=kind)
+        else:
+            upload = SpooledUpload(self.size, self.digest.hexdigest(), data=bytes(self.buffer), kind=kind)
+        if kind == 'docx' and not upload.is_docx():
+            raise UnsupportedFormatError()
+        return upload
+
+    def discard(self) -> None:
+        if self.spool is not None:
+            self.spool.close()
+            os.unlink(self.spool.name)
+            self.spool = None
+
+class SpooledUpload:
+    """An uploaded document held in memory when small and in a temp file once it grows.
+
+    Instances are cheap to pickle: large uploads cross into worker processes as
+    a path rather than as a copy of their bytes. kind is the format sniffed
+    from the content (see sniff_format), which is what parsers dispatch on.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        sha256: str,
+        data: Optional[bytes] = None,
+        path: Optional[str] = None,
+        kind: Optional[str] = None
+    ):
+        self.size = size
+        self.sha256 = sha256
+        self.data = data
+        self.path = path
+        self.kind = kind
+
+    @staticmethod
+    async def from_upload(file: UploadFile, max_bytes: int, spool_threshold: int) -> "SpooledUpload":
+        """Copy an upload in chunks, hashing as we go and spilling to disk past spool_threshold.
+
+        Raises UploadTooLargeError past max_bytes and UnsupportedFormatError for
+        content that isn't a PDF, DOCX or text document, in both cases without
+        reading the rest of the body.
+        """
+        spooler = _Spooler(max_bytes, spool_threshold)
+        try:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                spooler.feed(chunk)
+            return spooler.finish()
+        except BaseException:
+            spooler.discard()
+            raise
+
+    @staticmethod
+    def from_stream(stream: BinaryIO, max_bytes: int, spool_threshold: int) -> "SpooledUpload":
+        """Blocking counterpart of from_upload for file objects, e.g. a zip archive member"""
+        spooler = _Spooler(max_bytes, spool_threshold)
+        try:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                spooler.feed(chunk)
+            return spooler.finish()
+        except BaseException:
+            spooler.discard()
+            raise
+
+    @staticmethod
+    def from_bytes(content: bytes) -> "SpooledUpload":
+        """Wrap bytes that are already in memory"""
+        upload = SpooledUpload(
+            len(content),
+            hashlib.sha256(content).hexdigest(),
+            data=content,
+            kind=sniff_format(content[:SNIFF_BYTES])
+        )
+        if upload.kind == 'docx' and not upload.is_docx():
+            upload.kind = None
+        return upload
+
+    def open(self) -> BinaryIO:
+        """Open the upload for reading without copying it"""
+        if self.data is not None:
+            return io.BytesIO(self.data)
+        return open(self.path, "rb")
+
+    def is_docx(self) -> bool:
+        with self.open() as stream:
+            return is_docx_package(stream)
+
+    def cleanup(self) -> None:
+        """Remove the temp file backing a spilled upload"""
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+class BodySizeLimitMiddleware:
+    """Answers 413 for request bodies over a per-path limit, before the body is parsed.
+
+    A Content-Length over the limit is refused without reading anything; a
+    body without one (chunked) is counted as it's received and the request
+    fails as soon as it passes the limit, so it's never spooled in full.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope['path']) if scope['type'] == 'http' else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = str(UploadTooLargeError(limit))
+        headers = dict(scope['headers'])
+        content_length = headers.get(b'content-length', b'')
+        if content_length.isdigit() and int(content_length) > limit:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,138 @@
+# tests/test_job_sources.py
+import asyncio
+import gc
+import warnings
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from app.services.job_sources import GreenhouseSource, JobSourcePool, LeverSource, RSSSource
+
+GREENHOUSE_JOBS = {
+    "jobs": [
+        {
+            "title": "Senior Backend Engineer",
+            "location": {"name": "Remote"},
+            "content": "&lt;p&gt;Python &amp;amp; PostgreSQL&lt;/p&gt;",
+            "absolute_url": "https://boards.example/acme/1"
+        },
+        {"title": "Office Manager", "content": "", "absolute_url": "https://boards.example/acme/2"}
+    ]
+}
+
+LEVER_POSTINGS = [
+    {
+        "text": "Backend Engineer",
+        "categories": {"location": "Berlin"},
+        "descriptionPlain": "Join the platform team.",
+        "lists": [{"text": "Requirements", "content": "<li>Go</li><li>Kafka</li>"}],
+        "salaryRange": {"min": 70000, "max": 90000, "currency": "EUR"},
+        "hostedUrl": "https://jobs.example/initech/1"
+    }
+]
+
+RSS_FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Example Jobs</title>
+<item><title>Backend Engineer</title><link>https://feed.example/1</link>
+<description>&lt;b&gt;Rust&lt;/b&gt; and AWS</description><category>Austin</category></item>
+<item><title>Designer</title><link>https://feed.example/2</link></item>
+</channel></rss>"""
+
+def _stub_app() -> web.Application:
+    async def greenhouse(request: web.Request) -> web.Response:
+        assert request.query["content"] == "true"
+        return web.json_response(GREENHOUSE_JOBS)
+
+    async def lever(request: web.Request) -> web.Response:
+        return web.json_response(LEVER_POSTINGS)
+
+    async def rss(request: web.Request) -> web.Response:
+        return web.Response(body=RSS_FEED, content_type="application/rss+xml")
+
+    async def slow(request: web.Request) -> web.Response:
+        await asyncio.sleep(5)
+        return web.json_response({"jobs": []})
+
+    async def broken(request: web.Request) -> web.Response:
+        return web.Response(status=503)
+
+    app = web.Application()
+    app.router.add_get("/v1/boards/acme/jobs", greenhouse)
+    app.router.add_get("/v1/boards/slow/jobs", slow)
+    app.router.add_get("/v1/boards/broken/jobs", broken)
+    app.router.add_get("/v0/postings/initech", lever)
+    app.router.add_get("/feed.rss", rss)
+    return app
+
+async def _fetch(source, job_title: str = "backend engineer", limit: int = 10):
+    async with TestServer(_stub_app()) as server:
+        base_url = str(server.make_url("/"))
+        source = source(base_url)
+        async with aiohttp.ClientSession() as session:
+            return await source.fetch(session, job_title, "", limit)
+
+def test_greenhouse_source_maps_and_filters_postings():
+    postings = asyncio.run(_fetch(lambda url: GreenhouseSource("acme", url, timeout=1)))
+    assert postings == [{
+        "title": "Senior Backend Engineer",
+        "company": "acme",
+        "location": "Remote",
+        "description": "Python & PostgreSQL",
+        "salary": "",
+        "url": "https://boards.example/acme/1",
+        "source": "greenhouse:acme"
+    }]
+
+def test_lever_source_reads_lists_and_salary():
+    postings = asyncio.run(_fetch(lambda url: LeverSource("initech", url, timeout=1)))
+    assert len(postings) == 1
+    assert postings[0]["description"] == "Join the platform team. Go Kafka"
+    assert postings[0]["salary"] == "70,000 - 90,000 EUR"
+    assert postings[0]["location"] == "Berlin"
+
+def test_rss_source_parses_items():
+    postings = asyncio.run(_fetch(lambda url: RSSSource(url + "feed.rss", timeout=1)))
+    assert [(p["title"], p["company"], p["description"], p["location"]) for p in postings] == [
+        ("Backend Engineer", "Example Jobs", "Rust and AWS", "Austin")
+    ]
+
+def test_pool_reports_failed_and_timed_out_sources():
+    async def search():
+        async with TestServer(_stub_app()) as server:
+            base_url = str(server.make_url("/"))
+            pool = JobSourcePool(
+                [
+                    GreenhouseSource("acme", base_url, timeout=1),
+                    GreenhouseSource("slow", base_url, timeout=0.2),
+                    GreenhouseSource("broken", base_url, timeout=1)
+                ],
+                max_connections=10,
+                max_connections_per_host=5
+            )
+            try:
+                return await pool.search("backend engineer", "", 10)
+            finally:
+                await pool.close()
+
+    jobs, report = asyncio.run(search())
+    assert [job["url"] for job in jobs] == ["https://boards.example/acme/1"]
+    assert report["greenhouse:acme"]["jobs"] == 1
+    assert "timed out" in report["greenhouse:slow"]["error"]
+    assert "503" in report["greenhouse:broken"]["error"]
+
+def test_pool_closes_session_left_on_another_loop():
+    pool = JobSourcePool([], max_connections=10, max_connections_per_host=5)
+    first = asyncio.run(pool.session())
+
+    async def second_loop():
+        session = await pool.session()
+        await pool.close()
+        return session
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        second = asyncio.run(second_loop())
+        assert first.closed
+        del first
+        gc.collect()
+    assert second.closed
+    assert not [warning for warning in caught if "Unclosed" in str(warning.message)]